@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AjaxConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'AJAX'
+
+    def ready(self):
+        from AJAX import signals  # noqa: F401
@@ -0,0 +1,243 @@
+"""
+SQL of the DataTables server-side protocol for the snippet lists. Every value of
+the request is a bound parameter and the ORDER BY column and direction come from
+whitelists, so a listing has only a few distinct statement texts. PostgreSQL runs
+them as prepared statements, which keeps their plans warm for the connection.
+"""
+import base64
+import binascii
+import datetime as dt
+import hashlib
+import json
+import math
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection
+
+from MainApp.langs import supported_langs
+from MainApp.search import search_sql
+from MainApp.trigram import trigram_search_sql
+
+# Sortable columns of the listing and their SQL expressions
+SORTABLE_COLUMNS = {
+    'name': 's."name"',
+    'lang': 's.lang_id',
+    'like_count': 's.like_count',
+    'comment_count': 's.comment_count',
+    'author': 'u.username',
+    'is_private': 's.is_private',
+    'creation_date': 's.creation_date',
+    'rank': 'rank',
+}
+# Columns which can be used as a keyset and the type of their values: they are plain columns
+# of a snippet row, so "WHERE (column, id) > (last value, last id)" continues the listing without OFFSET.
+KEYSET_COLUMNS = {
+    'name': str,
+    'lang': str,
+    'like_count': int,
+    'comment_count': int,
+    'author': str,
+    'is_private': bool,
+    'creation_date': dt.datetime,
+}
+ORDER_DIRECTIONS = ('asc', 'desc')
+
+# Search modes take the query and the filters of the listing, the username ('' for the
+# public snippets) and the language; full-text search leaves the filtering to the WHERE clause
+SEARCH_MODES = {
+    'fulltext': lambda search, username, lang: search_sql(search),
+    'trigram': lambda search, username, lang: trigram_search_sql(search, username=username, lang=lang),
+}
+
+# Upper bound of the statements prepared on one connection
+MAX_PREPARED_STATEMENTS = 100
+PLACEHOLDER_RE = re.compile(r'%([s%])')
+
+Filter = namedtuple('Filter', ['where', 'where_params', 'rank', 'rank_params'])
+
+
+def _int_param(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def encode_cursor(order_col, row):
+    """Returns the opaque cursor of the page after the row, with the full precision of its value"""
+    value = row[order_col]
+    if isinstance(value, dt.datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([order_col, value, row['id']]).encode()).decode()
+
+
+def decode_cursor(order_col, cursor):
+    """Returns (value, id) of the last row of the previous page, as query parameters, or raises ValueError"""
+    try:
+        cursor_col, value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value_type = KEYSET_COLUMNS[cursor_col]
+        if value_type is dt.datetime:
+            value = connection.ops.adapt_datetimefield_value(dt.datetime.fromisoformat(value))
+        elif type(value) is not value_type:
+            raise TypeError(value)
+    except (TypeError, KeyError, UnicodeDecodeError, binascii.Error) as error:
+        # json.JSONDecodeError is a ValueError
+        raise ValueError(f'Bad cursor: {cursor}') from error
+    if cursor_col != order_col or type(row_id) is not int:
+        raise ValueError(f'Cursor of another listing: {cursor}')
+    return value, row_id
+
+
+class SnippetsQuery:
+    def __init__(self, username='', search=None, search_mode='fulltext', order_col=None, order_dir=None,
+                 start=0, length=-1, cursor=None, lang=None):
+        self.username = username
+        self.filter = self._filter(search, search_mode, username, lang)
+        if self.filter.rank and order_col not in SORTABLE_COLUMNS:
+            order_col, order_dir = 'rank', 'desc'
+        self.order_col = order_col if order_col in SORTABLE_COLUMNS else 'creation_date'
+        self.order_dir = order_dir if order_dir in ORDER_DIRECTIONS else 'desc'
+        self.start = max(start, 0)
+        self.length = length
+        self.keyset = False
+        if cursor and self.order_col in KEYSET_COLUMNS:
+            try:
+                self.after, self.after_id = decode_cursor(self.order_col, cursor)
+                self.keyset = True
+            except ValueError:
+                # A bad cursor is ignored like an unknown column, the page is read with OFFSET
+                pass
+
+    @classmethod
+    def from_request(cls, request, username=''):
+        order_i = request.GET.get('order[0][column]')
+        lang = request.GET.get('lang')
+        return cls(
+            username=username,
+            search=request.GET.get('search[value]'),
+            search_mode=request.GET.get('search_mode', 'fulltext'),
+            order_col=request.GET.get(f'columns[{order_i}][data]'),
+            order_dir=request.GET.get('order[0][dir]'),
+            start=_int_param(request.GET.get('start'), 0),
+            length=_int_param(request.GET.get('length'), -1),
+            cursor=request.GET.get('cursor'),
+            # Unknown languages are ignored like unknown columns
+            lang=lang if lang and lang in supported_langs() else None,
+        )
+
+    @staticmethod
+    def _filter(search, search_mode, username, lang=None):
+        where = 'u.username = %s' if username else 'NOT s.is_private'
+        params = [username] if username else []
+        if lang:
+            where += ' AND s.lang_id = %s'
+            params.append(lang)
+        if search_mode in SEARCH_MODES:
+            fragment = SEARCH_MODES[search_mode](search, username, lang)
+            if fragment:
+                return Filter(f'{where} AND {fragment.where}', params + fragment.where_params,
+                              fragment.rank, fragment.rank_params)
+            return Filter(where, params, None, [])
+        where += ''' AND (s."name" LIKE %s OR s.lang_id LIKE %s OR u.username LIKE %s)'''
+        return Filter(where, params + [f'{search if search else ""}%'] * 3, None, [])
+
+    @property
+    def page_number(self):
+        return math.ceil(self.start / self.length) + 1
+
+    def page_sql(self):
+        where, where_params, rank, rank_params = self.filter
+        column = SORTABLE_COLUMNS[self.order_col]
+        sql = f'''
+        SELECT
+            s.id AS id,
+            s."name" AS "name",
+            s.lang_id AS lang,
+            s.like_count AS like_count,
+            s.comment_count AS comment_count,
+            {"s.is_private AS is_private" if self.username else "u.username AS author"},
+            s.creation_date AS creation_date,
+            s.slug AS slug,
+            {rank if rank else "0"} AS rank
+        FROM "MainApp_snippet" AS s
+        LEFT OUTER JOIN "auth_user" AS u ON s.author_id = u.id
+        WHERE {where}
+        '''
+        params = rank_params + where_params
+        if self.keyset:
+            sql += f' AND ({column}, s.id) {"<" if self.order_dir == "desc" else ">"} (%s, %s)'
+            params += [self.after, self.after_id]
+        # The ORDER BY follows an index (see MainApp.models.Snippet.Meta.indexes)
+        # where there is one, so the page read stops after LIMIT rows.
+        sql += f' ORDER BY {column} {self.order_dir}, s.id {self.order_dir}'
+        if self.length >= 0:
+            sql += ' LIMIT %s'
+            params.append(self.length)
+            if not self.keyset:
+                sql += ' OFFSET %s'
+                params.append(self.start)
+        return sql, params
+
+    def count_sql(self):
+        sql = f'''
+        SELECT COUNT(*)
+        FROM "MainApp_snippet" AS s
+        LEFT OUTER JOIN "auth_user" AS u ON s.author_id = u.id
+        WHERE {self.filter.where}
+        '''
+        return sql, list(self.filter.where_params)
+
+
+def _prepared_statements():
+    """Names of the statements prepared on the current database connection"""
+    if getattr(connection, 'prepared_statements_of', None) is not connection.connection:
+        connection.prepared_statements = set()
+        connection.prepared_statements_of = connection.connection
+    return connection.prepared_statements
+
+
+def _to_prepare(sql):
+    """Turns the %s placeholders of a statement into $1, $2, ... of PREPARE"""
+    numbers = iter(range(1, sql.count('%s') + 1))
+    return PLACEHOLDER_RE.sub(lambda match: f'${next(numbers)}' if match.group(1) == 's' else '%', sql)
+
+
+def execute(cursor, sql, params, prepared=None):
+    """Executes a statement, on PostgreSQL through PREPARE / EXECUTE unless turned off"""
+    if prepared is None:
+        # A connection closed at the end of the request (CONN_MAX_AGE = 0, as under ASGI) would
+        # pay for the PREPARE each time and never run the statement again
+        prepared = settings.SNIPPETS_PREPARED_STATEMENTS and connection.settings_dict['CONN_MAX_AGE'] != 0
+    if not prepared or connection.vendor != 'postgresql':
+        # sqlite3 keeps its own cache of compiled statements keyed by their text
+        cursor.execute(sql, params)
+        return
+    statements = _prepared_statements()
+    name = f'snippets_{hashlib.sha1(sql.encode()).hexdigest()[:16]}'
+    if name not in statements:
+        if len(statements) >= MAX_PREPARED_STATEMENTS:
+            cursor.execute(sql, params)
+            return
+        cursor.execute(f'PREPARE {name} AS {_to_prepare(sql)}')
+        statements.add(name)
+    if params:
+        cursor.execute(f'EXECUTE {name} ({", ".join(["%s"] * len(params))})', params)
+    else:
+        cursor.execute(f'EXECUTE {name}')
+
+
+def fetch_page(query, prepared=None):
+    sql, params = query.page_sql()
+    with connection.cursor() as cursor:
+        execute(cursor, sql, params, prepared)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def count_filtered(query, prepared=None):
+    sql, params = query.count_sql()
+    with connection.cursor() as cursor:
+        execute(cursor, sql, params, prepared)
+        return cursor.fetchone()[0]
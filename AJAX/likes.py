@@ -0,0 +1,70 @@
+"""
+Setting the like state of a snippet. The (snippet, author) unique constraint makes
+liking twice a no-op, and the like counter only moves when a row is really added or removed.
+"""
+from django.db import IntegrityError, connection, transaction
+
+from AJAX.models import SnippetLike
+from MainApp.cache import invalidate_index_page
+from MainApp.models import Snippet
+
+# One round-trip on PostgreSQL: the counter is moved by the number of rows the
+# data-modifying CTE has really inserted or deleted. Both CTEs only touch likes of
+# public snippets, like the UPDATE, so the likes of a private snippet stay as they are.
+POSTGRES_LIKE_SQL = '''
+WITH changed AS (
+    INSERT INTO "AJAX_snippetlike" (snippet_id, author_id, date)
+    SELECT s.id, %s, now() FROM "MainApp_snippet" AS s WHERE s.id = %s AND s.is_private = FALSE
+    ON CONFLICT (snippet_id, author_id) DO NOTHING
+    RETURNING snippet_id
+)
+UPDATE "MainApp_snippet" SET like_count = like_count + (SELECT COUNT(*) FROM changed),
+    activity_date = CASE WHEN EXISTS (SELECT 1 FROM changed) THEN now() ELSE activity_date END
+WHERE id = %s AND is_private = FALSE
+RETURNING like_count
+'''
+
+POSTGRES_UNLIKE_SQL = '''
+WITH changed AS (
+    DELETE FROM "AJAX_snippetlike" AS l USING "MainApp_snippet" AS s
+    WHERE l.author_id = %s AND l.snippet_id = %s AND s.id = l.snippet_id AND s.is_private = FALSE
+    RETURNING l.snippet_id
+)
+UPDATE "MainApp_snippet" SET like_count = like_count - (SELECT COUNT(*) FROM changed),
+    activity_date = CASE WHEN EXISTS (SELECT 1 FROM changed) THEN now() ELSE activity_date END
+WHERE id = %s AND is_private = FALSE
+RETURNING like_count
+'''
+
+
+def _set_like_postgres(snippet_id, user_id, liked):
+    with connection.cursor() as cursor:
+        cursor.execute(POSTGRES_LIKE_SQL if liked else POSTGRES_UNLIKE_SQL, [user_id, snippet_id, snippet_id])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    invalidate_index_page()
+    return row[0]
+
+
+def _set_like_fallback(snippet_id, user_id, liked):
+    # The counter is moved by the SnippetLike signals
+    with transaction.atomic():
+        if not Snippet.objects.select_for_update().filter(pk=snippet_id, is_private=False).exists():
+            return None
+        if liked:
+            try:
+                with transaction.atomic():
+                    SnippetLike.objects.create(snippet_id=snippet_id, author_id=user_id)
+            except IntegrityError:
+                pass
+        else:
+            SnippetLike.objects.filter(snippet_id=snippet_id, author_id=user_id).delete()
+        return Snippet.objects.values_list('like_count', flat=True).get(pk=snippet_id)
+
+
+def set_snippet_like(snippet_id, user_id, liked):
+    """Likes or unlikes a public snippet and returns its new like count, or None if there is no such snippet"""
+    if connection.vendor == 'postgresql':
+        return _set_like_postgres(snippet_id, user_id, liked)
+    return _set_like_fallback(snippet_id, user_id, liked)
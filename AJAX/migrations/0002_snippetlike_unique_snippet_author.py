@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    SnippetLike = apps.get_model('AJAX', 'SnippetLike')
+    Snippet = apps.get_model('MainApp', 'Snippet')
+
+    duplicates = (SnippetLike.objects.order_by()
+                                     .values('snippet', 'author')
+                                     .annotate(keep=Min('pk'), count=Count('pk'))
+                                     .filter(count__gt=1))
+    snippet_ids = set()
+    for duplicate in duplicates:
+        SnippetLike.objects.filter(snippet=duplicate['snippet'], author=duplicate['author']) \
+                           .exclude(pk=duplicate['keep']).delete()
+        snippet_ids.add(duplicate['snippet'])
+
+    # The counters have been inflated by the duplicates
+    Snippet.objects.filter(pk__in=snippet_ids).update(like_count=Coalesce(Subquery(
+        SnippetLike.objects.filter(snippet=OuterRef('pk'))
+                           .order_by()
+                           .values('snippet')
+                           .annotate(count=Count('pk'))
+                           .values('count')
+    ), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AJAX', '0001_initial'),
+        ('MainApp', '0004_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='snippetlike',
+            constraint=models.UniqueConstraint(fields=('snippet', 'author'), name='snippetlike_unique_snippet_author'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.1 on 2026-10-18 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AJAX', '0002_snippetlike_unique_snippet_author'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='snippetlike',
+            name='date',
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='snippetlike',
+            index=models.Index(fields=['date'], name='snippetlike_date_idx'),
+        ),
+    ]
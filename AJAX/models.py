@@ -8,6 +8,17 @@ from MainApp.models import Snippet
 class SnippetLike(models.Model):
     snippet = models.ForeignKey(Snippet, on_delete=models.CASCADE)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Unknown for the likes made before it was added, they only count in the all-time leaderboards
+    date = models.DateTimeField(auto_now_add=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['snippet', 'author'], name='snippetlike_unique_snippet_author'),
+        ]
+        indexes = [
+            # Likes of the day / week leaderboards (MainApp.leaderboards)
+            models.Index(fields=['date'], name='snippetlike_date_idx'),
+        ]
 
 
 class CommentLike(models.Model):
@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from AJAX.datatables import SnippetsQuery, _to_prepare, count_filtered, fetch_page
+from MainApp.models import Snippet, SupportedLang
+
+
+class SnippetsQueryTest(TestCase):
+    def test_values_are_bound(self):
+        sql, params = SnippetsQuery(username="x' OR '1'='1", search="name'; --", search_mode='prefix',
+                                    length=10).page_sql()
+        self.assertNotIn("'1'='1", sql)
+        self.assertNotIn('--', sql)
+        self.assertIn("x' OR '1'='1", params)
+
+    def test_order_is_whitelisted(self):
+        query = SnippetsQuery(order_col='name; DROP TABLE auth_user', order_dir='desc; --')
+        self.assertEqual((query.order_col, query.order_dir), ('creation_date', 'desc'))
+        self.assertNotIn('DROP', query.page_sql()[0])
+
+    def test_statement_text_does_not_depend_on_values(self):
+        first = SnippetsQuery(search='print', start=0, length=10).page_sql()
+        second = SnippetsQuery(search='import', start=20, length=10).page_sql()
+        self.assertEqual(first[0], second[0])
+        self.assertNotEqual(first[1], second[1])
+
+    def test_placeholders_of_prepare(self):
+        self.assertEqual(_to_prepare('SELECT %s WHERE a %% %s'), 'SELECT $1 WHERE a % $2')
+
+
+@unittest.skipIf(connection.vendor != 'postgresql', 'Prepared statements are used on PostgreSQL only')
+class PreparedStatementsTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        for num in range(3):
+            Snippet.objects.create(name=f'Test Snippet {num}', lang=self.lang, code='print("Test code")',
+                                   is_private=False, author=self.user)
+
+    def test_prepared_and_plain_results_match(self):
+        for search in ('print', 'snippet', None):
+            query = SnippetsQuery(search=search, start=0, length=2)
+            self.assertEqual(fetch_page(query, prepared=True), fetch_page(query, prepared=False))
+            self.assertEqual(count_filtered(query, prepared=True), count_filtered(query, prepared=False))
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pg_prepared_statements WHERE name LIKE 'snippets_%%'")
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_not_prepared_on_connections_closed_after_the_request(self):
+        query = SnippetsQuery(search='print', start=0, length=2)
+        with connection.cursor() as cursor:
+            cursor.execute('DEALLOCATE ALL')
+        connection.prepared_statements = set()
+        with mock.patch.dict(connection.settings_dict, CONN_MAX_AGE=0):
+            fetch_page(query)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pg_prepared_statements WHERE name LIKE 'snippets_%%'")
+            self.assertEqual(cursor.fetchone()[0], 0)
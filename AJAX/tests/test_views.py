@@ -0,0 +1,504 @@
+import json
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from AJAX.datatables import encode_cursor
+from AJAX.models import SnippetLike
+from MainApp.models import Snippet, SupportedLang
+from pet_Snippets import ratelimit
+
+
+class SnippetNonPrivateJsonViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+
+        number_of_public_snippets = 25
+        for snippet_num in range(number_of_public_snippets):
+            Snippet.objects.create(
+                name=f'Test Snippet {snippet_num:02}',
+                slug=f'test-snippet-{snippet_num:02}',
+                lang=self.lang,
+                code='print("Test code")',
+                is_private=False,
+                author=self.user
+            )
+        Snippet.objects.create(
+            name='Test Private Snippet',
+            slug='test-private-snippet',
+            lang=self.lang,
+            code='print("Test code")',
+            is_private=True,
+            author=self.user
+        )
+
+    def get_page(self, **params):
+        data = {
+            'order[0][column]': '0',
+            'columns[0][data]': 'name',
+            'order[0][dir]': 'asc',
+        }
+        data.update(params)
+        response = self.client.get(reverse('snippet_non_private_json'), data)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_view_url_exists_at_desired_location(self):
+        response = self.client.get('/ajax/snippet_non_private/json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_view_returns_all_without_paging(self):
+        response = self.get_page()
+        self.assertEqual(len(response['data']), 25)
+        self.assertEqual(response['recordsTotal'], 26)
+        self.assertEqual(response['recordsFiltered'], 25)
+
+    def test_offset_paging(self):
+        response = self.get_page(start=20, length=10)
+        self.assertEqual([row['name'] for row in response['data']],
+                         [f'Test Snippet {num:02}' for num in range(20, 25)])
+        self.assertEqual(response['recordsFiltered'], 25)
+        self.assertEqual(response['page'], 3)
+        self.assertEqual(response['per_page'], 10)
+
+    def test_offset_past_the_end(self):
+        response = self.get_page(start=100, length=10)
+        self.assertEqual(response['data'], [])
+        self.assertEqual(response['recordsFiltered'], 25)
+
+    def test_keyset_paging(self):
+        first_page = self.get_page(start=0, length=10)
+        second_page = self.get_page(start=10, length=10, cursor=first_page['next_cursor'])
+        self.assertEqual([row['name'] for row in second_page['data']],
+                         [f'Test Snippet {num:02}' for num in range(10, 20)])
+        self.assertEqual(second_page['recordsFiltered'], 25)
+
+    def test_keyset_paging_descending(self):
+        first_page = self.get_page(start=0, length=10, **{'order[0][dir]': 'desc'})
+        second_page = self.get_page(start=10, length=10, cursor=first_page['next_cursor'],
+                                    **{'order[0][dir]': 'desc'})
+        self.assertEqual([row['name'] for row in second_page['data']],
+                         [f'Test Snippet {num:02}' for num in range(14, 4, -1)])
+
+    def test_keyset_paging_by_creation_date(self):
+        # Within one millisecond, so only the full precision of the cursor tells them apart
+        base = timezone.now().replace(microsecond=138000)
+        for num, snippet in enumerate(Snippet.objects.filter(is_private=False).order_by('name')):
+            Snippet.objects.filter(pk=snippet.pk).update(creation_date=base + timedelta(microseconds=num * 10))
+        params = {'columns[0][data]': 'creation_date', 'order[0][dir]': 'desc', 'length': 10}
+        names, cursor = [], None
+        for start in range(0, 30, 10):
+            page = self.get_page(start=start, **params, **({'cursor': cursor} if cursor else {}))
+            names += [row['name'] for row in page['data']]
+            cursor = page.get('next_cursor')
+        self.assertEqual(names, [f'Test Snippet {num:02}' for num in range(24, -1, -1)])
+
+    def test_keyset_paging_by_is_private(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        params = {'order[0][column]': '0', 'columns[0][data]': 'is_private', 'order[0][dir]': 'asc', 'length': 20}
+        first_page = self.client.get(reverse('snippet_user_is_author_json'), params).json()
+        second_page = self.client.get(reverse('snippet_user_is_author_json'),
+                                      {**params, 'start': 20, 'cursor': first_page['next_cursor']}).json()
+        self.assertEqual([row['is_private'] for row in second_page['data']], [False] * 5 + [True])
+
+    def test_bad_cursor_falls_back_to_offset(self):
+        for cursor in ('not a cursor', encode_cursor('like_count', {'like_count': 0, 'id': 1})):
+            response = self.get_page(start=10, length=10, cursor=cursor)
+            self.assertEqual(response['data'][0]['name'], 'Test Snippet 10')
+
+    def test_search_filters_records(self):
+        response = self.get_page(start=0, length=10, **{'search[value]': 'Test Snippet 1'})
+        self.assertEqual(response['recordsFiltered'], 10)
+        self.assertEqual(len(response['data']), 10)
+
+    def test_fulltext_search_looks_into_code(self):
+        response = self.get_page(start=0, length=10, **{'search[value]': 'print'})
+        self.assertEqual(response['recordsFiltered'], 25)
+        response = self.get_page(start=0, length=10, search_mode='prefix', **{'search[value]': 'print'})
+        self.assertEqual(response['recordsFiltered'], 0)
+
+    def test_unknown_order_column_is_ignored(self):
+        response = self.get_page(start=0, length=10, **{'columns[0][data]': 'id) --'})
+        self.assertEqual(len(response['data']), 10)
+
+    def test_trigram_search_matches_substrings(self):
+        cache.clear()
+        response = self.get_page(start=0, length=10, search_mode='trigram', **{'search[value]': 'nippet 2'})
+        self.assertEqual(response['recordsFiltered'], 5)
+
+    def test_lang_filter(self):
+        other_lang = SupportedLang.objects.create(lang='OtherLang')
+        Snippet.objects.filter(slug__in=['test-snippet-00', 'test-snippet-01']).update(lang=other_lang)
+        response = self.get_page(lang='OtherLang')
+        self.assertEqual([row['name'] for row in response['data']], ['Test Snippet 00', 'Test Snippet 01'])
+        response = self.get_page(lang='UnknownLang')
+        self.assertEqual(response['recordsFiltered'], 25)
+
+
+class SnippetsJsonConditionalGetTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+        self.url = reverse('snippet_non_private_json')
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.client.get(self.url, {'start': 0, 'length': 10, '_': 1})['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'start': 0, 'length': 10, '_': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_like_changes_etag(self):
+        etag = self.client.get(self.url, {'start': 0, 'length': 10})['ETag']
+        SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+        response = self.client.get(self.url, {'start': 0, 'length': 10}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['like_count'], 1)
+
+    def test_list_version_expires(self):
+        # Another worker with its own cache may have missed an invalidation
+        etag = self.client.get(self.url, {'start': 0, 'length': 10})['ETag']
+        later = time.time() + settings.INDEX_PAGE_CACHE_TIMEOUT + 1
+        with mock.patch('time.time', return_value=later):
+            response = self.client.get(self.url, {'start': 0, 'length': 10}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_cache_control(self):
+        self.assertIn('public', self.client.get(self.url)['Cache-Control'])
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        response = self.client.get(reverse('snippet_user_is_author_json'))
+        self.assertIn('private', response['Cache-Control'])
+
+
+class SwitchSnippetLikeViewTest(TestCase):
+    def setUp(self) -> None:
+        ratelimit.reset()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+
+    def test_like_count_follows_switches(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        url = reverse('switch_snippetlike', kwargs={'snippet_id': self.snippet.id})
+
+        response = self.client.get(url)
+        self.assertFalse(response.json()['was_liked'])
+        self.assertEqual(response.json()['like_count'], 1)
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.like_count, 1)
+
+        response = self.client.get(url)
+        self.assertTrue(response.json()['was_liked'])
+        self.assertEqual(response.json()['like_count'], 0)
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.like_count, 0)
+
+    def test_like_count_after_liker_is_deleted(self):
+        liker = User.objects.create_user(username='Liker')
+        SnippetLike.objects.create(snippet=self.snippet, author=liker)
+        SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+        liker.delete()
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.like_count, 1)
+
+
+class SnippetLikeViewTest(TestCase):
+    def setUp(self) -> None:
+        ratelimit.reset()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+        self.url = reverse('snippet_like', kwargs={'snippet_id': self.snippet.id})
+
+    def test_view_redirect_if_not_logged_in(self):
+        response = self.client.post(self.url, {'liked': 'true'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_like_is_idempotent(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        for _ in range(3):
+            response = self.client.post(self.url, {'liked': 'true'})
+            self.assertEqual(response.json(), {'liked': True, 'like_count': 1})
+        for _ in range(3):
+            response = self.client.post(self.url, {'liked': 'false'})
+            self.assertEqual(response.json(), {'liked': False, 'like_count': 0})
+        self.assertFalse(SnippetLike.objects.exists())
+
+    def test_private_snippet_cannot_be_liked(self):
+        self.snippet.is_private = True
+        self.snippet.save()
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        response = self.client.post(self.url, {'liked': 'true'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_private_snippet_cannot_be_unliked(self):
+        SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+        Snippet.objects.filter(pk=self.snippet.pk).update(is_private=True)
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        response = self.client.post(self.url, {'liked': 'false'})
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(SnippetLike.objects.exists())
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.like_count, 1)
+
+    def test_duplicate_likes_are_rejected(self):
+        SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+        with self.assertRaises(IntegrityError):
+            SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+
+
+@unittest.skipIf(connection.vendor == 'sqlite', 'SQLite locks the whole database on concurrent writes')
+class ConcurrentSnippetLikeTest(TransactionTestCase):
+    def setUp(self) -> None:
+        self.users = [User.objects.create_user(username=f'TestUser{num}') for num in range(8)]
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.users[0]
+        )
+
+    def test_like_count_stays_exact(self):
+        from AJAX.likes import set_snippet_like
+
+        def toggle(args):
+            user, liked = args
+            try:
+                set_snippet_like(self.snippet.id, user.id, liked)
+            finally:
+                connections.close_all()
+
+        # Every user sends a burst of likes and unlikes, ending with a like for even users
+        requests = [(user, (num + user_num) % 2 == 0) for num in range(20) for user_num, user in enumerate(self.users)]
+        requests += [(user, user_num % 2 == 0) for user_num, user in enumerate(self.users)]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(toggle, requests[:-len(self.users)]))
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(toggle, requests[-len(self.users):]))
+
+        self.snippet.refresh_from_db()
+        self.assertEqual(SnippetLike.objects.filter(snippet=self.snippet).count(), len(self.users) // 2)
+        self.assertEqual(self.snippet.like_count, len(self.users) // 2)
+
+
+class AsyncViewsTest(TestCase):
+    def setUp(self) -> None:
+        ratelimit.reset()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+
+    async def test_list(self):
+        response = await self.async_client.get(reverse('snippet_non_private_json'), {'start': 0, 'length': 10})
+        self.assertEqual(response.json()['recordsFiltered'], 1)
+
+    async def test_user_list_redirect_if_not_logged_in(self):
+        response = await self.async_client.get(reverse('snippet_user_is_author_json'))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_like(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        await self.async_client.get(reverse('switch_snippetlike', kwargs={'snippet_id': self.snippet.id}))
+        response = await self.async_client.get(reverse('snippet_user_is_author_json'), {'start': 0, 'length': 10})
+        self.assertEqual(response.json()['data'][0]['like_count'], 1)
+
+
+class SnippetJsonUserIsAuthorExportTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        other_user = User.objects.create_user(username='OtherUser')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        Snippet.objects.bulk_create([
+            Snippet(name=f'Test Snippet {num}', slug=f'test-snippet-{num}', lang=self.lang, code='print("Test code")',
+                    is_private=num % 2 == 0, author=self.user)
+            for num in range(3000)
+        ] + [Snippet(name='Other Snippet', slug='other-snippet', lang=self.lang, code='print("Test code")',
+                     is_private=False, author=other_user)])
+
+    def export(self):
+        response = self.client.get(reverse('snippet_user_is_author_json_export'))
+        self.assertTrue(response.streaming)
+        return response
+
+    def test_export_redirect_if_not_logged_in(self):
+        response = self.client.get(reverse('snippet_user_is_author_json_export'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_export_has_whole_list(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        result = json.loads(b''.join(self.export().streaming_content))
+        self.assertEqual(result['recordsTotal'], 3000)
+        self.assertEqual(len(result['data']), 3000)
+        self.assertEqual(set(result['data'][0]), {'name', 'lang', 'like_count', 'comment_count', 'is_private',
+                                                  'creation_date', 'slug'})
+        self.assertNotIn('other-snippet', {row['slug'] for row in result['data']})
+
+    def export_peak_memory(self):
+        response = self.export()
+        size = 0
+        tracemalloc.start()
+        try:
+            for chunk in response.streaming_content:
+                size += len(chunk)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return size, peak
+
+    def test_export_memory_does_not_grow_with_list(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        self.export_peak_memory()
+        size, peak = self.export_peak_memory()
+        Snippet.objects.bulk_create([
+            Snippet(name=f'Test Snippet {num}', slug=f'test-snippet-{num}', lang=self.lang, code='print("Test code")',
+                    is_private=False, author=self.user)
+            for num in range(3000, 9000)
+        ])
+        larger_size, larger_peak = self.export_peak_memory()
+        self.assertGreater(larger_size, size * 2.5)
+        self.assertLess(larger_peak, peak * 1.5)
+
+    def test_empty_export(self):
+        User.objects.create_user(username='EmptyUser', password='Pa55w.rd')
+        self.client.login(username='EmptyUser', password='Pa55w.rd')
+        self.assertEqual(json.loads(b''.join(self.export().streaming_content)), {'data': [], 'recordsTotal': 0})
+
+
+class SnippetsBatchJsonViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.other_user = User.objects.create_user(username='OtherUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippets = [
+            Snippet.objects.create(
+                name=f'Test Snippet {snippet_num}',
+                lang=self.lang,
+                code=f'print({snippet_num})',
+                is_private=False,
+                author=self.user
+            )
+            for snippet_num in range(30)
+        ]
+        self.private = Snippet.objects.create(
+            name='Test Private Snippet',
+            lang=self.lang,
+            code='print("Test code")',
+            is_private=True,
+            author=self.user
+        )
+
+    def get_batch(self, **params):
+        return self.client.get(reverse('snippets_batch_json'), params)
+
+    def test_slugs_and_ids(self):
+        response = self.get_batch(slug=[self.snippets[0].slug, self.snippets[1].slug], id=self.snippets[2].id)
+        data = response.json()['data']
+        self.assertEqual([row['id'] for row in data], [snippet.id for snippet in self.snippets[:3]])
+        self.assertEqual(data[0]['code'], 'print(0)')
+        self.assertEqual(data[0]['author'], 'TestUser')
+
+    def test_constant_number_of_queries(self):
+        with self.assertNumQueries(1):
+            self.get_batch(id=self.snippets[0].id)
+        with self.assertNumQueries(1):
+            self.get_batch(id=','.join(str(snippet.id) for snippet in self.snippets))
+
+    def test_private_snippet_only_for_author(self):
+        response = self.get_batch(id=f'{self.snippets[0].id},{self.private.id},0')
+        self.assertEqual(len(response.json()['data']), 1)
+        self.assertEqual(response.json()['errors'], {f'id:{self.private.id}': 'private', 'id:0': 'not found'})
+
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        response = self.get_batch(id=self.private.id)
+        self.assertEqual(response.json()['data'][0]['slug'], self.private.slug)
+        self.assertIn('private', response['Cache-Control'])
+
+        self.client.login(username='OtherUser', password='Pa55w.rd')
+        response = self.get_batch(id=self.private.id)
+        self.assertEqual(response.json()['data'], [])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.get_batch().status_code, 400)
+        self.assertEqual(self.get_batch(id='one').status_code, 400)
+        self.assertEqual(self.get_batch(id=','.join(str(num) for num in range(1, 102))).status_code, 400)
+
+
+class SnippetsExportImportViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=True,
+            author=self.user
+        )
+
+    def test_export_redirect_if_not_logged_in(self):
+        response = self.client.get(reverse('snippets_export'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_export_and_import(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        for export_format, file_name, count in (('ndjson', 'snippets.ndjson', 1), ('tar', 'snippets.tar.gz', 2)):
+            response = self.client.get(reverse('snippets_export'), {'format': export_format})
+            self.assertEqual(response.status_code, 200)
+            archive = SimpleUploadedFile(file_name, b''.join(response.streaming_content))
+            response = self.client.post(reverse('snippets_import'), {'file': archive})
+            self.assertEqual(response.json(), {'created': count, 'skipped': 0, 'invalid': 0, 'errors': []})
+        self.assertEqual(Snippet.objects.filter(author=self.user, name='TestName').count(), 4)
+
+    def test_import_does_not_add_languages(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        archive = SimpleUploadedFile('snippets.ndjson', b'{"name": "TestName", "lang": "NewLang", "code": "pass"}')
+        response = self.client.post(reverse('snippets_import'), {'file': archive})
+        self.assertEqual(response.json()['errors'], ['Row 1: unknown language "NewLang"'])
+        self.assertFalse(SupportedLang.objects.filter(lang='NewLang').exists())
+
+    def test_import_broken_file(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        archive = SimpleUploadedFile('snippets.ndjson', b'{not json')
+        response = self.client.post(reverse('snippets_import'), {'file': archive})
+        self.assertEqual(response.status_code, 400)
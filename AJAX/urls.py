@@ -3,8 +3,15 @@ from . import views
 
 
 urlpatterns = [
+    path('snippet_like/<int:snippet_id>', views.snippet_like, name='snippet_like'),
     path('switch_snippetlike/<int:snippet_id>', views.switch_snippetlike, name='switch_snippetlike'),
     path('snippet_non_private/json', views.snippet_json_non_private, name='snippet_non_private_json'),
     path('snippet_user_is_author/json', views.snippet_json_user_is_author, name='snippet_user_is_author_json'),
+    path('snippet_user_is_author/json/export', views.snippet_json_user_is_author_export,
+         name='snippet_user_is_author_json_export'),
+    path('snippets/export', views.snippets_export, name='snippets_export'),
+    path('snippets/import', views.snippets_import, name='snippets_import'),
+    path('snippets/batch', views.snippets_batch_json, name='snippets_batch_json'),
+    path('leaderboards/<str:board>/<str:window>', views.leaderboard_json, name='leaderboard_json'),
 ]
 
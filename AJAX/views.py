@@ -1,83 +1,207 @@
-import math
+import tarfile
 
 from django.contrib.auth.decorators import login_required
-from django.db import connection
-from django.http import JsonResponse
+from django.db.models import Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_POST
 
+from AJAX.datatables import KEYSET_COLUMNS, SnippetsQuery, count_filtered, encode_cursor, fetch_page
+from AJAX.likes import set_snippet_like
 from AJAX.models import SnippetLike
+from MainApp.bulk import (FORMATS, export_chunks, export_rows, guess_format, import_rows, json_list_chunks,
+                          list_rows, read_rows)
+from MainApp.conditional import list_etag, set_cache_control
+from MainApp.leaderboards import BOARDS, LEADERBOARD_SIZE, WINDOWS, top_entries
 from MainApp.models import Snippet
+from pet_Snippets.async_views import (async_login_required, async_require_POST, db_semaphore, get_user, run_db,
+                                      stream_in_thread)
+from pet_Snippets.ratelimit import rate_limit
 
+# Upper bound of the snippets of one batch request
+MAX_BATCH_SIZE = 100
 
-def snippets_json(request, username=''):
-    search = request.GET.get('search[value]')
-    order_i = request.GET.get('order[0][column]')
-    order_col = request.GET.get(f'columns[{order_i}][data]')
-    order_dir = request.GET.get('order[0][dir]')
-    start = request.GET.get('start')
-    length = request.GET.get('length')
-
-    sql = f'''
-    WITH vars(search_var) AS (values('{search if search else ""}%')) 
-    SELECT 
-        s.name AS name, 
-        s.lang_id AS lang, 
-        COUNT(DISTINCT sl.id) AS like_count, 
-        COUNT(DISTINCT c.id) AS comment_count, 
-        {"s.is_private AS is_private" if username else "u.username AS author"}, 
-        s.creation_date AS creation_date, 
-        s.slug AS slug 
-    FROM "MainApp_snippet" AS s 
-    LEFT OUTER JOIN "Comments_comment" AS c ON s.id = c.snippet_id 
-    LEFT OUTER JOIN "AJAX_snippetlike" AS sl ON s.id = sl.snippet_id 
-    LEFT OUTER JOIN "auth_user" AS u ON s.author_id = u.id, 
-    vars {f"WHERE u.username = '{username}'" if username else "WHERE s.is_private = FALSE"} 
-    GROUP BY s.id, u.username, vars.search_var 
-    HAVING s."name" LIKE vars.search_var 
-        OR s.lang_id  LIKE vars.search_var 
-        OR u.username LIKE vars.search_var 
-    ORDER BY {order_col if order_col else 'creation_date'} {order_dir if order_dir else 'desc'}
-    '''
-
-    with connection.cursor() as cursor:
-        cursor.execute(sql)
-        columns = [col[0] for col in cursor.description]
-        data = [
-            dict(zip(columns, row))
-            for row in cursor.fetchall()
-        ]
+
+def snippets_page(request, username=''):
+    # Search backends may query the database while building the SQL
+    query = SnippetsQuery.from_request(request, username)
+    rows = fetch_page(query)
+
+    next_cursor = None
+    # The listings of the user have no author column and the public one has no is_private column
+    if rows and query.order_col in KEYSET_COLUMNS and query.order_col in rows[-1]:
+        next_cursor = encode_cursor(query.order_col, rows[-1])
+
+    if query.length < 0:
+        records_filtered = len(rows)
+    else:
+        records_filtered = count_filtered(query)
+
+    data = []
+    for row in rows:
+        del row['id'], row['rank']
+        data.append(row)
 
     response = {
         'data': data,
         'recordsTotal': Snippet.objects.all().count(),
-        'recordsFiltered': len(data)
+        'recordsFiltered': records_filtered,
     }
 
-    if start and length:
+    if query.length > 0:
         response.update({
-            'data': data[int(start):int(start) + int(length)],
-            'page': math.ceil(int(start) / int(length)) + 1,
-            'per_page': int(length),
+            'page': query.page_number,
+            'per_page': query.length,
         })
-    # pp(connection.queries)
-    return JsonResponse(response)
+    if next_cursor:
+        response['next_cursor'] = next_cursor
+    return response
+
+
+async def snippets_json(request, username=''):
+    etag = await list_etag(request, username)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(await run_db(snippets_page, request, username))
+        response['ETag'] = etag
+    set_cache_control(response, public=not username)
+    return response
 
 
-def snippet_json_non_private(request):
-    return snippets_json(request)
+async def snippet_json_non_private(request):
+    return await snippets_json(request)
+
+
+@async_login_required
+async def snippet_json_user_is_author(request):
+    return await snippets_json(request, request.user.username)
 
 
 @login_required
-def snippet_json_user_is_author(request):
-    return snippets_json(request, request.user.username)
+def snippet_json_user_is_author_export(request):
+    """The whole listing of the user, encoded while it is read, so its size does not matter"""
+    rows = list_rows(Snippet.objects.filter(author=request.user))
+    response = StreamingHttpResponse(stream_in_thread(json_list_chunks(rows)), content_type='application/json')
+    response['Content-Disposition'] = 'attachment; filename="my_snippets.json"'
+    set_cache_control(response, public=False)
+    return response
 
 
-def switch_snippetlike(request, snippet_id):
-    snippet = Snippet.objects.get(pk=snippet_id)
-    response = {
-        'was_liked': SnippetLike.objects.filter(snippet=snippet, author=request.user).exists()
-    }
-    if response['was_liked']:
-        SnippetLike.objects.filter(snippet=snippet, author=request.user).delete()
+@async_login_required
+@async_require_POST
+@rate_limit('like')
+async def snippet_like(request, snippet_id):
+    liked = request.POST.get('liked') in ('1', 'true')
+    like_count = await run_db(set_snippet_like, snippet_id, request.user.id, liked)
+    if like_count is None:
+        raise Http404
+    return JsonResponse({'liked': liked, 'like_count': like_count})
+
+
+@async_login_required
+@rate_limit('like')
+async def switch_snippetlike(request, snippet_id):
+    async with db_semaphore():
+        was_liked = await SnippetLike.objects.filter(snippet_id=snippet_id, author_id=request.user.id).aexists()
+    like_count = await run_db(set_snippet_like, snippet_id, request.user.id, not was_liked)
+    if like_count is None:
+        raise Http404
+    return JsonResponse({'was_liked': was_liked, 'like_count': like_count})
+
+
+def _batch_keys(request):
+    """Requested ("slug", value) pairs and then ("id", value) pairs in the given order, without repeats"""
+    keys = []
+    for name in ('slug', 'id'):
+        for value in request.GET.getlist(name):
+            for item in filter(None, value.split(',')):
+                key = (name, int(item) if name == 'id' else item)
+                if key not in keys:
+                    keys.append(key)
+    return keys
+
+
+def snippets_batch(keys, user):
+    slugs = [value for name, value in keys if name == 'slug']
+    ids = [value for name, value in keys if name == 'id']
+    # One query however many snippets are asked for
+    snippets = Snippet.objects.select_related('author', 'code_blob').filter(Q(slug__in=slugs) | Q(pk__in=ids))
+    by_key = {}
+    for snippet in snippets:
+        by_key[('slug', snippet.slug)] = by_key[('id', snippet.id)] = snippet
+
+    data, errors = [], {}
+    for name, value in keys:
+        snippet = by_key.get((name, value))
+        if snippet is None:
+            errors[f'{name}:{value}'] = 'not found'
+        elif snippet.is_private and snippet.author_id != user.id:
+            errors[f'{name}:{value}'] = 'private'
+        else:
+            data.append(snippet.to_dict_json(detailed=True))
+    return {'data': data, 'errors': errors}
+
+
+async def snippets_batch_json(request):
+    try:
+        keys = _batch_keys(request)
+    except ValueError:
+        return JsonResponse({'error': 'id must be a number'}, status=400)
+    if not keys:
+        return JsonResponse({'error': 'No slug or id is given'}, status=400)
+    if len(keys) > MAX_BATCH_SIZE:
+        return JsonResponse({'error': f'At most {MAX_BATCH_SIZE} snippets can be requested at once'}, status=400)
+    user = await get_user(request)
+    response = JsonResponse(await run_db(snippets_batch, keys, user))
+    # Anonymous users never get private snippets, so their responses can be shared
+    set_cache_control(response, public=not user.is_authenticated)
+    return response
+
+
+@login_required
+def snippets_export(request):
+    export_format = request.GET.get('format', 'ndjson')
+    if export_format not in FORMATS:
+        return JsonResponse({'error': f'Unknown format "{export_format}"'}, status=400)
+    chunks = stream_in_thread(export_chunks(export_rows(Snippet.objects.filter(author=request.user)), export_format))
+    if export_format == 'tar':
+        response = StreamingHttpResponse(chunks, content_type='application/gzip')
+        response['Content-Disposition'] = 'attachment; filename="snippets.tar.gz"'
     else:
-        SnippetLike.objects.create(snippet=snippet, author=request.user)
-    return JsonResponse(response)
+        response = StreamingHttpResponse(chunks, content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="snippets.ndjson"'
+    return response
+
+
+@login_required
+@require_POST
+def snippets_import(request):
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'error': 'No file is uploaded'}, status=400)
+    import_format = request.POST.get('format') or guess_format(upload.name)
+    if import_format not in FORMATS:
+        return JsonResponse({'error': f'Unknown format "{import_format}"'}, status=400)
+    try:
+        result = import_rows(read_rows(upload, import_format), author=request.user)
+    except (ValueError, KeyError, tarfile.TarError) as error:
+        return JsonResponse({'error': f'Broken archive: {error}'}, status=400)
+    return JsonResponse(result.as_dict())
+
+
+def leaderboard_json(request, board, window):
+    if board not in BOARDS or window not in WINDOWS:
+        return JsonResponse({'error': f'Unknown leaderboard "{board}/{window}"'}, status=404)
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), LEADERBOARD_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+    lang = request.GET.get('lang', '')
+    response = JsonResponse({
+        'board': board,
+        'window': window,
+        'lang': lang,
+        'data': list(top_entries(board, window, lang, limit)),
+    })
+    set_cache_control(response, public=True)
+    return response
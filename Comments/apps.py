@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CommentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Comments'
+
+    def ready(self):
+        from Comments import signals  # noqa: F401
@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['snippet', '-date', '-id'], name='comment_snippet_date_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Comments', '0002_comment_snippet_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['date'], name='comment_date_idx'),
+        ),
+    ]
@@ -9,3 +9,10 @@ class Comment(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     date = models.DateTimeField(auto_now_add=True)
     text = models.TextField(max_length=250)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['snippet', '-date', '-id'], name='comment_snippet_date_idx'),
+            # Comments of the day / week leaderboards (MainApp.leaderboards)
+            models.Index(fields=['date'], name='comment_date_idx'),
+        ]
@@ -0,0 +1,44 @@
+import base64
+import datetime as dt
+
+from django.db.models import Q
+from django.utils import dateformat, timezone
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(comment):
+    return base64.urlsafe_b64encode(f'{comment.date.isoformat()}|{comment.id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns (date, id) of the last comment of the previous page or raises ValueError"""
+    try:
+        date, comment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return dt.datetime.fromisoformat(date), int(comment_id)
+    except (TypeError, UnicodeDecodeError, base64.binascii.Error) as error:
+        raise ValueError(f'Bad cursor: {cursor}') from error
+
+
+def comment_page(snippet, cursor=None, limit=PAGE_SIZE):
+    """Returns the comments of a snippet from the newest ones and the cursor of the next page (or None)"""
+    comments = snippet.comment_set.select_related('author').order_by('-date', '-id')
+    if cursor:
+        date, comment_id = decode_cursor(cursor)
+        comments = comments.filter(Q(date__lt=date) | Q(date=date, id__lt=comment_id))
+    comments = list(comments[:limit + 1])
+    if len(comments) > limit:
+        return comments[:limit], encode_cursor(comments[limit - 1])
+    return comments, None
+
+
+def comment_to_dict_json(comment, user):
+    return {
+        'id': comment.id,
+        'author': comment.author.username,
+        'date': comment.date.isoformat(),
+        'date_display': dateformat.format(timezone.localtime(comment.date), 'd.m.Y в H:i'),
+        'text': comment.text,
+        'can_delete': comment.author_id == user.id,
+    }
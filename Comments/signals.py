@@ -0,0 +1,25 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from Comments.models import Comment
+from MainApp.cache import invalidate_index_page
+from MainApp.models import Snippet
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Snippet.objects.filter(pk=instance.snippet_id).update(
+            comment_count=F('comment_count') + 1, activity_date=timezone.now()
+        )
+        invalidate_index_page()
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Snippet.objects.filter(pk=instance.snippet_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1, activity_date=timezone.now()
+    )
+    invalidate_index_page()
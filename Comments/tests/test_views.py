@@ -1,13 +1,18 @@
+import datetime
+
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 from Comments.models import Comment
 from MainApp.models import Snippet, SupportedLang
+from pet_Snippets import ratelimit
 
 
 class CreateCommentViewTest(TestCase):
     def setUp(self) -> None:
+        ratelimit.reset()
         self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
         self.lang = SupportedLang.objects.create(lang='TestLang')
         self.snippet = Snippet.objects.create(
@@ -71,3 +76,88 @@ class DeleteCommentViewTest(TestCase):
         self.client.login(username='TestUser', password='Pa55w.rd')
         self.client.get(reverse('delete_comment', kwargs={'pk': self.comment.id}))
         self.assertFalse(Comment.objects.filter(snippet=self.snippet).exists())
+
+
+class CommentCountTest(TestCase):
+    def setUp(self) -> None:
+        ratelimit.reset()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+
+    def test_comment_count_follows_create_and_delete(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        self.client.post(reverse('create_comment'), {'snippet': self.snippet.id, 'text': 'TestText'})
+        self.client.post(reverse('create_comment'), {'snippet': self.snippet.id, 'text': 'TestText'})
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.comment_count, 2)
+
+        comment = Comment.objects.filter(snippet=self.snippet).first()
+        self.client.get(reverse('delete_comment', kwargs={'pk': comment.id}))
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.comment_count, 1)
+
+    def test_comment_count_after_commenter_is_deleted(self):
+        commenter = User.objects.create_user(username='Commenter')
+        Comment.objects.create(snippet=self.snippet, author=commenter, text='TestText')
+        Comment.objects.create(snippet=self.snippet, author=self.user, text='TestText')
+        commenter.delete()
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.comment_count, 1)
+
+
+class CommentsJsonViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+        # Half of the comments share the same date, so the id has to break the ties
+        date = timezone.now()
+        comments = Comment.objects.bulk_create([
+            Comment(snippet=self.snippet, author=self.user, text=f'Comment {num}') for num in range(45)
+        ])
+        for num, comment in enumerate(comments):
+            comment.date = date if num % 2 else date - datetime.timedelta(seconds=num)
+        Comment.objects.bulk_update(comments, ['date'])
+
+    def test_pages_follow_each_other(self):
+        url = reverse('comments_json', kwargs={'snippet_id': self.snippet.id})
+        texts, cursor = [], None
+        while True:
+            response = self.client.get(url, {'cursor': cursor} if cursor else {})
+            self.assertEqual(response.status_code, 200)
+            texts += [comment['text'] for comment in response.json()['data']]
+            cursor = response.json()['next_cursor']
+            if cursor is None:
+                break
+        expected = Comment.objects.filter(snippet=self.snippet).order_by('-date', '-id').values_list('text', flat=True)
+        self.assertEqual(texts, list(expected))
+
+    def test_page_size_is_limited(self):
+        url = reverse('comments_json', kwargs={'snippet_id': self.snippet.id})
+        response = self.client.get(url, {'limit': 10})
+        self.assertEqual(len(response.json()['data']), 10)
+
+    def test_bad_cursor(self):
+        url = reverse('comments_json', kwargs={'snippet_id': self.snippet.id})
+        response = self.client.get(url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_private_snippet_comments_are_hidden(self):
+        self.snippet.is_private = True
+        self.snippet.save()
+        url = reverse('comments_json', kwargs={'snippet_id': self.snippet.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
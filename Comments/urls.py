@@ -4,5 +4,6 @@ from . import views
 
 urlpatterns = [
     path('create', views.create_comment, name='create_comment'),
-    path('delete/<int:pk>', views.delete_comment, name='delete_comment')
+    path('delete/<int:pk>', views.delete_comment, name='delete_comment'),
+    path('<int:snippet_id>/json', views.comments_json, name='comments_json'),
 ]
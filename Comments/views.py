@@ -1,22 +1,42 @@
-from django.contrib.auth.decorators import login_required
-from django.shortcuts import redirect
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect
 
 from MainApp.models import Snippet
+from pet_Snippets.async_views import async_login_required, db_semaphore, run_db
+from pet_Snippets.ratelimit import rate_limit
 from .forms import CommentForm
 from .models import Comment
+from .pagination import MAX_PAGE_SIZE, PAGE_SIZE, comment_page, comment_to_dict_json
 
 
-@login_required(redirect_field_name=None)
-def create_comment(request):
+@async_login_required(redirect_field_name=None)
+@rate_limit('comment')
+async def create_comment(request):
     if request.method == 'POST':
         form = CommentForm(request.POST)
         form.instance.author = request.user
-        form.instance.snippet = Snippet.objects.get(pk=request.POST.get('snippet'))
+        async with db_semaphore():
+            form.instance.snippet = await Snippet.objects.aget(pk=request.POST.get('snippet'))
         if form.is_valid():
-            form.save()
+            await run_db(form.save)
     return redirect(request.META.get('HTTP_REFERER', '/'))
 
 
 def delete_comment(request, pk):
     Comment.objects.get(pk=pk, author=request.user).delete()
     return redirect(request.META.get('HTTP_REFERER', '/'))
+
+
+def comments_json(request, snippet_id):
+    snippet = get_object_or_404(Snippet, pk=snippet_id)
+    if snippet.is_private and snippet.author_id != request.user.id:
+        return JsonResponse({'error': 'Snippet is private'}, status=403)
+    try:
+        limit = min(max(int(request.GET.get('limit', PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        comments, next_cursor = comment_page(snippet, request.GET.get('cursor'), limit)
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    return JsonResponse({
+        'data': [comment_to_dict_json(comment, request.user) for comment in comments],
+        'next_cursor': next_cursor,
+    })
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MainappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'MainApp'
+
+    def ready(self):
+        from MainApp import signals  # noqa: F401
@@ -0,0 +1,337 @@
+"""
+Benchmark harness: seeds users, snippets, comments and likes in long-tailed
+distributions and times the hot endpoints, reporting latency percentiles,
+query counts and peak memory as JSON-ready dicts.
+"""
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from AJAX.datatables import SnippetsQuery, count_filtered, fetch_page
+from AJAX.models import SnippetLike
+from Comments.models import Comment
+from .cache import invalidate_index_page
+from .langs import invalidate_langs
+from .models import Snippet, SupportedLang
+from .search import index_snippets
+from .trigram import reset_fallback_index
+
+USERNAME_PREFIX = 'bench_user_'
+LANGS = {'Python': 30, 'JavaScript': 25, 'Java': 12, 'C++': 10, 'Go': 7, 'Rust': 5, 'SQL': 5, 'Bash': 4, 'Ruby': 2}
+PRIVATE_SHARE = 0.15
+# Per snippet of a data size
+USERS_PER_SNIPPET = 0.05
+COMMENTS_PER_SNIPPET = 3
+LIKES_PER_SNIPPET = 5
+BATCH_SIZE = 500
+PERCENTILES = (50, 90, 95, 99)
+
+
+def long_tail_weights(rng, count, alpha=1.2):
+    """A few users write most of the snippets and a few snippets get most of the attention"""
+    return [rng.paretovariate(alpha) for _ in range(count)]
+
+
+def fake_code(rng, lang):
+    lines = max(1, min(int(rng.lognormvariate(2.5, 0.8)), 150))
+    return '\n'.join(f'# {lang} line {num}: value_{rng.randrange(1000)} = compute({num})' for num in range(lines))[:5000]
+
+
+def seed(users=0, snippets=0, comments=0, likes=0, rng=None):
+    """Adds the given number of objects to the database and returns how many of each have been created"""
+    rng = rng or random.Random(0)
+    SupportedLang.objects.bulk_create([SupportedLang(lang=lang) for lang in LANGS], ignore_conflicts=True)
+    invalidate_langs()
+
+    first = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+    User.objects.bulk_create([User(username=f'{USERNAME_PREFIX}{first + num}') for num in range(users)],
+                             batch_size=BATCH_SIZE)
+    user_ids = list(User.objects.filter(username__startswith=USERNAME_PREFIX).values_list('pk', flat=True))
+    if not user_ids:
+        return {'users': users, 'snippets': 0, 'comments': 0, 'likes': 0}
+
+    author_weights = long_tail_weights(rng, len(user_ids))
+    for start in range(0, snippets, BATCH_SIZE):
+        batch = []
+        for num in range(start, min(start + BATCH_SIZE, snippets)):
+            lang = rng.choices(list(LANGS), weights=list(LANGS.values()))[0]
+            name = f'{lang} snippet {rng.randrange(10 ** 6)}'
+            batch.append(Snippet(
+                name=name,
+                slug=Snippet.make_slug(name),
+                lang_id=lang,
+                description=f'Benchmark snippet {num}',
+                code=fake_code(rng, lang),
+                is_private=rng.random() < PRIVATE_SHARE,
+                author_id=rng.choices(user_ids, weights=author_weights)[0],
+            ))
+        Snippet.objects.bulk_create(batch)
+        index_snippets(batch)
+
+    public_ids = list(Snippet.objects.filter(is_private=False).values_list('pk', flat=True))
+    if public_ids:
+        popularity = long_tail_weights(rng, len(public_ids))
+        for start in range(0, comments, BATCH_SIZE):
+            Comment.objects.bulk_create([
+                Comment(snippet_id=snippet_id, author_id=rng.choice(user_ids), text=f'Benchmark comment {start + num}')
+                for num, snippet_id in enumerate(rng.choices(public_ids, weights=popularity,
+                                                             k=min(BATCH_SIZE, comments - start)))
+            ])
+        for start in range(0, likes, BATCH_SIZE):
+            SnippetLike.objects.bulk_create([
+                SnippetLike(snippet_id=snippet_id, author_id=rng.choice(user_ids))
+                for snippet_id in rng.choices(public_ids, weights=popularity, k=min(BATCH_SIZE, likes - start))
+            ], ignore_conflicts=True)
+
+    call_command('rebuild_snippet_counters', stdout=StringIO())
+    invalidate_index_page()
+    reset_fallback_index()
+    return {'users': users, 'snippets': snippets, 'comments': comments, 'likes': likes}
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))]
+
+
+def endpoints(rng):
+    """Returns {name: (needs login, request factory)} of the timed endpoints"""
+    public_slugs = list(Snippet.objects.filter(is_private=False).values_list('slug', 'pk'))
+    datatables = {
+        'start': 0, 'length': 10,
+        'order[0][column]': '0', 'columns[0][data]': 'creation_date', 'order[0][dir]': 'desc',
+    }
+
+    def detail(client):
+        return client.get(reverse('snippet_detail_page', kwargs={'slug': rng.choice(public_slugs)[0]}))
+
+    def like(client):
+        return client.get(reverse('switch_snippetlike', kwargs={'snippet_id': rng.choice(public_slugs)[1]}))
+
+    def comment(client):
+        return client.post(reverse('create_comment'), {'snippet': rng.choice(public_slugs)[1], 'text': 'Benchmark'})
+
+    result = {
+        'index': (False, lambda client: client.get(reverse('home'))),
+        'snippets_json': (False, lambda client: client.get(reverse('snippet_non_private_json'), datatables)),
+        'user_snippets_json': (True, lambda client: client.get(reverse('snippet_user_is_author_json'), datatables)),
+    }
+    if public_slugs:
+        result.update({
+            'snippet_detail': (False, detail),
+            'switch_snippetlike': (True, like),
+            'create_comment': (True, comment),
+        })
+    return result
+
+
+def measure(make_request, client, requests):
+    latencies, queries = [], []
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = make_request(client)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+
+    # Tracing slows the requests down, so the peak memory is taken from one more request
+    tracemalloc.start()
+    try:
+        make_request(client)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'requests': requests,
+        'status': response.status_code,
+        'latency_ms': {
+            **{f'p{percent}': round(percentile(latencies, percent), 3) for percent in PERCENTILES},
+            'mean': round(statistics.fmean(latencies), 3),
+            'max': round(max(latencies), 3),
+        },
+        'queries': {'min': min(queries), 'max': max(queries), 'median': statistics.median(queries)},
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run(sizes, requests=50, only=None, rng=None):
+    """Grows the database to every size (number of snippets) in turn and times the endpoints at it"""
+    rng = rng or random.Random(0)
+    results, seeded = [], 0
+    # The benchmark user likes and comments far over the rate limits
+    with override_settings(ALLOWED_HOSTS=['testserver'], RATE_LIMIT_ENABLED=False):
+        for size in sorted(sizes):
+            added = size - seeded
+            if added > 0:
+                seed(users=max(1, round(added * USERS_PER_SNIPPET)), snippets=added,
+                     comments=added * COMMENTS_PER_SNIPPET, likes=added * LIKES_PER_SNIPPET, rng=rng)
+                seeded = size
+
+            anonymous, logged_in = Client(), Client()
+            logged_in.force_login(User.objects.filter(username__startswith=USERNAME_PREFIX)
+                                              .order_by('-snippet__id').first())
+            timings = {}
+            for name, (login, make_request) in endpoints(rng).items():
+                if only and name not in only:
+                    continue
+                timings[name] = measure(make_request, logged_in if login else anonymous, requests)
+            results.append({
+                'snippets': Snippet.objects.count(),
+                'users': User.objects.count(),
+                'comments': Comment.objects.count(),
+                'likes': SnippetLike.objects.count(),
+                'endpoints': timings,
+            })
+    return results
+
+
+def list_query_latencies(prepared, requests, rng):
+    """Times the public list query with the search terms changing from request to request"""
+    words = [lang.lower() for lang in LANGS] + ['snippet', 'compute', 'value']
+    latencies = []
+    for num in range(requests):
+        query = SnippetsQuery(search=rng.choice(words), search_mode='fulltext' if num % 2 else 'trigram',
+                              start=0, length=10)
+        started = time.perf_counter()
+        fetch_page(query, prepared)
+        count_filtered(query, prepared)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def compare_list_query(requests=200, rng=None):
+    """Warm-plan latency of the list query run as prepared statements against plain statements"""
+    rng = rng or random.Random(0)
+    result = {'vendor': connection.vendor}
+    for name, prepared in (('plain', False), ('prepared', True)):
+        # The first requests prepare the statements and warm the caches
+        list_query_latencies(prepared, 10, rng)
+        latencies = list_query_latencies(prepared, requests, rng)
+        result[name] = {
+            **{f'p{percent}': round(percentile(latencies, percent), 3) for percent in PERCENTILES},
+            'mean': round(statistics.fmean(latencies), 3),
+        }
+    return result
+
+
+def _timed_get(url, headers, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    except OSError:
+        status = None
+    return status, (time.perf_counter() - started) * 1000
+
+
+def load_test(urls, requests=1000, concurrency=32, headers=None, timeout=30):
+    """Sends GET requests to a running server from `concurrency` clients at once and reports the throughput"""
+    targets = [urls[num % len(urls)] for num in range(requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda url: _timed_get(url, headers or {}, timeout), targets))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for status, latency in results]
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(requests / elapsed, 1),
+        'statuses': statuses,
+        'latency_ms': {
+            **{f'p{percent}': round(percentile(latencies, percent), 3) for percent in PERCENTILES},
+            'mean': round(statistics.fmean(latencies), 3),
+        },
+    }
+
+
+def connection_latencies(conn_max_age, requests):
+    """Times a cheap request-sized query between the request_started and request_finished signals,
+    which open and close (or keep) the database connection like in a real request"""
+    connection.close()
+    saved = connection.settings_dict['CONN_MAX_AGE']
+    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+    latencies = []
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            request_started.send(sender=None)
+            Snippet.objects.filter(pk=1).exists()
+            request_finished.send(sender=None)
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = saved
+    return latencies
+
+
+def compare_connection_reuse(requests=200, conn_max_age=60):
+    """Per-request latency with a new connection for every request against a persistent one"""
+    result = {'vendor': connection.vendor}
+    for name, max_age in (('conn_max_age_0', 0), (f'conn_max_age_{conn_max_age}', conn_max_age)):
+        latencies = connection_latencies(max_age, requests)
+        result[name] = {
+            **{f'p{percent}': round(percentile(latencies, percent), 3) for percent in PERCENTILES},
+            'mean': round(statistics.fmean(latencies), 3),
+        }
+    return result
+
+
+# Run by a new interpreter: what a worker does before it serves the first request
+COLD_START_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.db import connection
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({"ms": (time.perf_counter() - started) * 1000, "connected": connection.connection is not None}))
+'''
+
+
+def cold_start(runs=10):
+    """Time from django.setup() to a loaded URLconf (all the views and forms imported) in new
+    interpreters, and whether the startup has connected to the database"""
+    latencies, connected = [], False
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], capture_output=True, text=True,
+                                 cwd=settings.BASE_DIR, env=os.environ, check=True)
+        result = json.loads(process.stdout.splitlines()[-1])
+        latencies.append(result['ms'])
+        connected = connected or result['connected']
+    return {
+        'runs': runs,
+        'connects_to_database': connected,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3),
+            'mean': round(statistics.fmean(latencies), 3),
+            'max': round(max(latencies), 3),
+        },
+    }
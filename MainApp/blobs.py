@@ -0,0 +1,59 @@
+"""
+Moving the code of the existing snippets into CodeBlob rows and back. Saved
+snippets go to the blobs by themselves with settings.SNIPPETS_CODE_BLOBS on.
+"""
+from django.db import transaction
+from django.db.models import Case, Value, When
+
+from .compression import compress
+from .models import CodeBlob, Snippet
+
+BATCH_SIZE = 500
+
+
+def _batches(queryset, batch_size):
+    last_pk = 0
+    while batch := list(queryset.filter(pk__gt=last_pk).order_by('pk')[:batch_size]):
+        yield batch
+        last_pk = batch[-1].pk
+
+
+def store_blobs(snippets):
+    """Stores the code of not saved snippets as blobs with one query, like Snippet.save() does for one"""
+    blobs = {}
+    for snippet in snippets:
+        code = snippet.code
+        snippet.code_blob_id = CodeBlob.make_digest(code)
+        blobs[snippet.code_blob_id] = CodeBlob(digest=snippet.code_blob_id, data=compress(code), size=len(code))
+    CodeBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+
+
+def move_to_blobs(batch_size=BATCH_SIZE):
+    """Stores the code of the snippets kept in their rows as blobs, returns the number of moved snippets"""
+    moved = 0
+    for batch in _batches(Snippet.objects.filter(code_blob__isnull=True).only('pk', 'code'), batch_size):
+        with transaction.atomic():
+            store_blobs(batch)
+            # update() keeps updated_at, the content of the snippets does not change
+            moved += Snippet.objects.filter(pk__in=[snippet.pk for snippet in batch], code_blob__isnull=True).update(
+                code='',
+                code_blob_id=Case(*[When(pk=snippet.pk, then=Value(snippet.code_blob_id)) for snippet in batch]),
+            )
+    return moved
+
+
+def move_from_blobs(batch_size=BATCH_SIZE):
+    """Puts the code of the snippets back to their rows, returns the number of moved snippets"""
+    moved = 0
+    queryset = Snippet.objects.filter(code_blob__isnull=False).select_related('code_blob').only('pk', 'code_blob')
+    for batch in _batches(queryset, batch_size):
+        with transaction.atomic():
+            moved += Snippet.objects.filter(pk__in=[snippet.pk for snippet in batch]).update(
+                code=Case(*[When(pk=snippet.pk, then=Value(snippet.code_blob.code)) for snippet in batch]),
+                code_blob=None,
+            )
+    return moved
+
+
+def delete_unused_blobs():
+    return CodeBlob.delete_unused()
@@ -0,0 +1,292 @@
+"""
+Streaming bulk export and import of snippets as NDJSON (one snippet per line)
+or as a gzipped tarball with one JSON file per snippet.
+"""
+import io
+import json
+import tarfile
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from .blobs import store_blobs
+from .cache import invalidate_index_page
+from .compression import decompress
+from .langs import invalidate_langs
+from .models import Snippet, SupportedLang
+from .search import index_snippets
+from .trigram import reset_fallback_index
+
+EXPORT_FIELDS = ('slug', 'name', 'lang_id', 'description', 'code', 'code_blob__data', 'is_private', 'creation_date',
+                 'author__username')
+FORMATS = ('ndjson', 'tar')
+# Columns of the DataTables listing of a user's snippets and the fields they are read from
+LIST_COLUMNS = ('name', 'lang', 'like_count', 'comment_count', 'is_private', 'creation_date', 'slug')
+LIST_FIELDS = ('name', 'lang_id', 'like_count', 'comment_count', 'is_private', 'creation_date', 'slug')
+BATCH_SIZE = 500
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def export_rows(queryset, chunk_size=BATCH_SIZE):
+    for row in queryset.order_by('pk').values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        yield {
+            'slug': row['slug'],
+            'name': row['name'],
+            'lang': row['lang_id'],
+            'description': row['description'],
+            'code': decompress(row['code_blob__data']) if row['code_blob__data'] is not None else row['code'],
+            'is_private': row['is_private'],
+            'creation_date': row['creation_date'],
+            'author': row['author__username'],
+        }
+
+
+def dump_row(row):
+    return json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def ndjson_chunks(rows):
+    for row in rows:
+        yield (dump_row(row) + '\n').encode()
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only file object for tarfile whose content is taken away by the generator after each member"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+def tar_chunks(rows):
+    buffer = _ChunkBuffer()
+    with tarfile.open(fileobj=buffer, mode='w|gz') as archive:
+        for row in rows:
+            data = dump_row(row).encode()
+            member = tarfile.TarInfo(f'snippets/{row["slug"]}.json')
+            member.size = len(data)
+            archive.addfile(member, io.BytesIO(data))
+            chunk = buffer.take()
+            if chunk:
+                yield chunk
+    yield buffer.take()
+
+
+def export_chunks(rows, export_format):
+    return tar_chunks(rows) if export_format == 'tar' else ndjson_chunks(rows)
+
+
+def list_rows(queryset, chunk_size=BATCH_SIZE):
+    """Rows of the listing fetched chunk by chunk (through a server-side cursor on PostgreSQL)"""
+    rows = queryset.order_by('-creation_date', '-id').values_list(*LIST_FIELDS)
+    for values in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(LIST_COLUMNS, values))
+
+
+def json_list_chunks(rows, chunk_size=BATCH_SIZE):
+    """Encodes the rows as {"data": [...], "recordsTotal": n} a batch of rows at a time"""
+    yield b'{"data":['
+    count = 0
+    for batch in batched(rows, chunk_size):
+        yield ((',' if count else '') + ','.join(dump_row(row) for row in batch)).encode()
+        count += len(batch)
+    yield f'],"recordsTotal":{count}}}'.encode()
+
+
+def read_ndjson(fileobj):
+    for line in fileobj:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_tar(fileobj):
+    with tarfile.open(fileobj=fileobj, mode='r|*') as archive:
+        for member in archive:
+            if member.isfile() and member.name.endswith('.json'):
+                yield json.load(archive.extractfile(member))
+
+
+def read_rows(fileobj, import_format):
+    return read_tar(fileobj) if import_format == 'tar' else read_ndjson(fileobj)
+
+
+def guess_format(filename):
+    return 'tar' if filename.endswith(('.tar', '.tar.gz', '.tgz')) else 'ndjson'
+
+
+def allocate_slugs(snippets, requested):
+    """Keeps the requested (exported) slugs where they are free and makes new ones otherwise"""
+    requested = [slugify(slug)[:Snippet._meta.get_field('slug').max_length] for slug in requested]
+    taken = set(Snippet.objects.filter(slug__in=[slug for slug in requested if slug])
+                               .values_list('slug', flat=True))
+    for snippet, slug in zip(snippets, requested):
+        if not slug or slug in taken:
+            slug = Snippet.make_slug(snippet.name)
+        taken.add(slug)
+        snippet.slug = slug
+
+
+# Invalid rows whose errors are reported, the rest are only counted
+MAX_REPORTED_ERRORS = 10
+BOOLEANS = {True: True, False: False, 'true': True, 'false': False, '1': True, '0': False}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.errors = []
+
+    def add_error(self, number, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f'Row {number}: {message}')
+
+    def as_dict(self):
+        return {'created': self.created, 'skipped': self.skipped, 'invalid': self.invalid, 'errors': self.errors}
+
+
+def _text(row, name, max_length, required=True):
+    value = row.get(name)
+    if value is None or value == '':
+        if required:
+            raise ValueError(f'{name} is required')
+        return ''
+    if not isinstance(value, str):
+        raise ValueError(f'{name} must be a string')
+    if len(value) > max_length:
+        raise ValueError(f'{name} is longer than {max_length} characters')
+    return value
+
+
+def _boolean(value):
+    key = value.lower() if isinstance(value, str) else value
+    try:
+        return BOOLEANS[key]
+    except (KeyError, TypeError):
+        raise ValueError(f'{value!r} is not a boolean') from None
+
+
+def _date(value):
+    if value is None:
+        return None
+    date = parse_datetime(value) if isinstance(value, str) else None
+    if date is None:
+        raise ValueError(f'{value!r} is not a date')
+    return timezone.make_aware(date) if timezone.is_naive(date) else date
+
+
+def clean_row(row):
+    """Returns the values of an exported row checked against the model fields, raises ValueError if one is bad"""
+    if not isinstance(row, dict):
+        raise ValueError('a snippet must be an object')
+    fields = Snippet._meta
+    return {
+        'name': _text(row, 'name', fields.get_field('name').max_length),
+        'lang': _text(row, 'lang', SupportedLang._meta.get_field('lang').max_length),
+        'description': _text(row, 'description', fields.get_field('description').max_length, required=False),
+        'code': _text(row, 'code', fields.get_field('code').max_length),
+        'is_private': _boolean(row.get('is_private', False)),
+        'creation_date': _date(row.get('creation_date')),
+        'slug': row['slug'] if isinstance(row.get('slug'), str) else '',
+        'author': row['author'] if isinstance(row.get('author'), str) else None,
+    }
+
+
+def import_rows(rows, author=None, default_author=None, create_langs=False, batch_size=BATCH_SIZE):
+    """
+    Creates snippets from exported rows in bulk_create batches. With `author` every
+    snippet is attributed to that user, otherwise to the user named in the row,
+    falling back to `default_author`; rows without a known author are skipped.
+    Rows with bad values, or with an unknown language unless `create_langs`, are invalid.
+    The import is one transaction: an error reading the rows leaves none of them created.
+    """
+    result = ImportResult()
+    with transaction.atomic():
+        for batch in batched(enumerate(rows, start=1), batch_size):
+            _import_batch(batch, author, default_author, create_langs, result)
+    if result.created:
+        invalidate_index_page()
+        reset_fallback_index()
+    return result
+
+
+def _import_batch(batch, author, default_author, create_langs, result):
+    rows = []
+    for number, row in batch:
+        try:
+            rows.append((number, clean_row(row)))
+        except ValueError as error:
+            result.add_error(number, error)
+
+    langs = {row['lang'] for _, row in rows}
+    if create_langs:
+        SupportedLang.objects.bulk_create([SupportedLang(lang=lang) for lang in langs], ignore_conflicts=True)
+        invalidate_langs()
+    else:
+        known = set(SupportedLang.objects.filter(lang__in=langs).values_list('lang', flat=True))
+        for number, row in rows:
+            if row['lang'] not in known:
+                result.add_error(number, f'unknown language "{row["lang"]}"')
+        rows = [(number, row) for number, row in rows if row['lang'] in known]
+
+    authors = {}
+    if author is None:
+        authors = User.objects.in_bulk({row['author'] for _, row in rows} - {None}, field_name='username')
+
+    snippets, slugs, dates = [], [], []
+    for _, row in rows:
+        snippet_author = author or authors.get(row['author']) or default_author
+        if snippet_author is None:
+            result.skipped += 1
+            continue
+        snippets.append(Snippet(
+            name=row['name'],
+            lang_id=row['lang'],
+            description=row['description'],
+            code=row['code'],
+            is_private=row['is_private'],
+            author=snippet_author,
+        ))
+        slugs.append(row['slug'])
+        dates.append(row['creation_date'])
+
+    if settings.SNIPPETS_CODE_BLOBS:
+        store_blobs(snippets)
+    allocate_slugs(snippets, slugs)
+    dates = {snippet.slug: date for snippet, date in zip(snippets, dates) if date is not None}
+    Snippet.objects.bulk_create(snippets)
+    if snippets and snippets[0].pk is None:
+        # Backends which can't return ids from bulk_create
+        snippets = list(Snippet.objects.filter(slug__in=[snippet.slug for snippet in snippets]))
+    # creation_date is set on insert (auto_now_add), the exported one is restored afterwards
+    restored = [snippet for snippet in snippets if snippet.slug in dates]
+    for snippet in restored:
+        snippet.creation_date = dates[snippet.slug]
+    Snippet.objects.bulk_update(restored, ['creation_date'], batch_size=BATCH_SIZE)
+    index_snippets(snippets)
+    result.created += len(snippets)
@@ -0,0 +1,23 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+INDEX_PAGE_CACHE_KEY = 'MainApp:index_page'
+# Changes whenever a snippet, like or comment does, the ETag of the list JSON is made of it.
+# It expires like the index page, so a per-process cache which missed the change of another
+# worker serves stale lists for that long at most
+LIST_VERSION_CACHE_KEY = 'MainApp:snippet_list_version'
+
+
+def invalidate_index_page():
+    cache.delete_many([INDEX_PAGE_CACHE_KEY, LIST_VERSION_CACHE_KEY])
+
+
+async def alist_version():
+    version = await cache.aget(LIST_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.aadd(LIST_VERSION_CACHE_KEY, version, settings.INDEX_PAGE_CACHE_TIMEOUT):
+            version = await cache.aget(LIST_VERSION_CACHE_KEY, version)
+    return version
@@ -0,0 +1,14 @@
+"""
+zlib compression of stored code (snippet revisions and code blobs).
+"""
+import zlib
+
+COMPRESSION_LEVEL = 9
+
+
+def compress(text):
+    return zlib.compress(text.encode(), COMPRESSION_LEVEL)
+
+
+def decompress(data):
+    return zlib.decompress(bytes(data)).decode()
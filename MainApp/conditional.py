@@ -0,0 +1,70 @@
+"""
+Conditional GET of the snippet pages and lists: unchanged resources answer 304
+after one cheap query (or a cache lookup for the lists), without rendering.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_cache_control, patch_vary_headers, quote_etag
+
+from .cache import alist_version
+from .models import Snippet
+
+# Query parameters which change with every DataTables request but not the response
+VOLATILE_PARAMS = ('_', 'draw')
+
+
+def _snippet(request, slug):
+    # The detail view takes the snippet from here, so the page costs no extra query
+    if not hasattr(request, 'snippet'):
+        request.snippet = Snippet.objects.select_related('author', 'code_blob').filter(slug=slug).first()
+    return request.snippet
+
+
+def snippet_last_modified(request, slug):
+    snippet = _snippet(request, slug)
+    if snippet is None or snippet.is_private and snippet.author_id != request.user.id:
+        # The view answers 404 / 403 itself
+        return None
+    return snippet.last_modified
+
+
+def snippet_etag(request, slug):
+    last_modified = snippet_last_modified(request, slug)
+    if last_modified is None:
+        return None
+    # The page shows the like state and the controls of the user, and embeds the CSRF token
+    # which is rotated on login, so a page kept from before the login cannot post
+    get_token(request)
+    csrf_secret = request.META['CSRF_COOKIE']
+    key = f'{request.snippet.id}:{last_modified.isoformat()}:{request.user.id}:{csrf_secret}'
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def set_cache_control(response, public):
+    if public:
+        patch_cache_control(response, public=True, max_age=settings.HTTP_CACHE_MAX_AGE, must_revalidate=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Cookie'])
+
+
+def snippet_cache_control(view):
+    """Public snippets seen by anonymous users may be kept by shared caches, the rest only by the browser"""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        snippet = getattr(request, 'snippet', None)
+        if response.status_code in (200, 304):
+            set_cache_control(response, public=bool(snippet and not snippet.is_private
+                                                    and not request.user.is_authenticated))
+        return response
+    return wrapper
+
+
+async def list_etag(request, username=''):
+    params = sorted((key, value) for key, value in request.GET.lists() if key not in VOLATILE_PARAMS)
+    key = f'{await alist_version()}:{username}:{params}'
+    return quote_etag(hashlib.md5(key.encode()).hexdigest())
@@ -1,13 +1,12 @@
 import django.forms as forms
+from MainApp.langs import lang_choices
 from MainApp.models import Snippet, SupportedLang
 
 
-CODE_LANGS = [('', '')]+[(code_lang.lang,)*2 for code_lang in SupportedLang.objects.all()]
-
-
 class SnippetForm(forms.ModelForm):
     name = forms.CharField(label='Имя')
-    lang = forms.ModelChoiceField(queryset=SupportedLang.objects.all(), label='Язык', empty_label='')
+    # Choices come from the language registry when the form is rendered or validated
+    lang = forms.ChoiceField(choices=lang_choices, label='Язык')
     description = forms.CharField(label='Описание', max_length=250,
                                   widget=forms.Textarea(attrs={"rows": 4}),
                                   required=False)
@@ -18,7 +17,5 @@ class SnippetForm(forms.ModelForm):
         model = Snippet
         fields = ['name', 'lang', 'description', 'code', 'is_private']
 
-
-
-
-        
\ No newline at end of file
+    def clean_lang(self):
+        return SupportedLang(lang=self.cleaned_data['lang'])
@@ -0,0 +1,44 @@
+"""
+Server-side syntax highlighting of snippet code. The rendered markup is cached
+under a hash of the language and the code, so a changed snippet never reads a
+stale entry; SnippetUpdateView drops the entry of the replaced code.
+"""
+import hashlib
+
+import pygments
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_by_name
+from pygments.util import ClassNotFound
+
+# Only the highlighted spans, <pre> and <code> are in the templates
+FORMATTER = HtmlFormatter(nowrap=True)
+
+
+def get_lexer(lang):
+    for alias in (lang.lower(), lang.lower().replace(' ', '')):
+        try:
+            return get_lexer_by_name(alias)
+        except ClassNotFound:
+            pass
+    return TextLexer()
+
+
+def highlight_cache_key(code, lang):
+    digest = hashlib.sha256(f'{lang}\0{code}'.encode()).hexdigest()
+    return f'MainApp:highlight:{pygments.__version__}:{digest}'
+
+
+def highlighted_code(code, lang):
+    key = highlight_cache_key(code, lang)
+    html = cache.get(key)
+    if html is None:
+        html = pygments.highlight(code, get_lexer(lang), FORMATTER)
+        cache.set(key, html, settings.HIGHLIGHT_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def invalidate_highlighted_code(code, lang):
+    cache.delete(highlight_cache_key(code, lang))
@@ -0,0 +1,29 @@
+"""
+Registry of the supported languages for the snippet form and the list filters.
+It is read from the cache and loaded from the database on first use, not at
+import time, and dropped whenever a SupportedLang row changes. The default cache
+is per process, so the other workers see the change once their copy expires
+after settings.SUPPORTED_LANGS_CACHE_TIMEOUT.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import SupportedLang
+
+LANGS_CACHE_KEY = 'MainApp:supported_langs'
+
+
+def _load_langs():
+    return list(SupportedLang.objects.order_by('lang').values_list('lang', flat=True))
+
+
+def supported_langs():
+    return cache.get_or_set(LANGS_CACHE_KEY, _load_langs, settings.SUPPORTED_LANGS_CACHE_TIMEOUT)
+
+
+def lang_choices():
+    return [('', '')] + [(lang, lang) for lang in supported_langs()]
+
+
+def invalidate_langs():
+    cache.delete(LANGS_CACHE_KEY)
@@ -0,0 +1,154 @@
+"""
+Precomputed leaderboards of the public snippets by likes and by comments for the
+last day, the last week and all time, for all languages and for every language.
+A refresh reads only the likes and comments of the window through their date
+index (all time reads the maintained counters) and replaces the stored top
+LEADERBOARD_SIZE of every leaderboard, so reading a top N is one index range.
+Refreshes come from the refresh_leaderboards command or from the in-process
+scheduler started with the WSGI / ASGI application.
+
+The day and week rankings are recomputed rather than maintained incrementally:
+they lose every like and comment once it ages out of the window, so keeping them
+up to date would mean processing every event twice (on arrival and on expiry)
+and keeping the scores of all snippets, not only of the stored top. Re-reading
+the window through the date index costs about as much, and much less code. The
+all-time ranking is read from the like and comment counters, which are
+maintained incrementally already.
+
+One refresh runs at a time across all the workers: it takes a PostgreSQL
+advisory lock (SQLite lets one writer in at a time anyway), and the scheduled
+refreshes skip when the stored leaderboards are newer than their interval.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from AJAX.models import SnippetLike
+from Comments.models import Comment
+from .cache import INDEX_PAGE_CACHE_KEY
+from .langs import supported_langs
+from .models import LeaderboardEntry, Snippet
+
+logger = logging.getLogger(__name__)
+
+# Board name: (model of the events, counter of the snippet)
+BOARDS = {
+    'likes': (SnippetLike, 'like_count'),
+    'comments': (Comment, 'comment_count'),
+}
+# Window name: its length, None for all time
+WINDOWS = {
+    'day': timedelta(days=1),
+    'week': timedelta(days=7),
+    'all': None,
+}
+LEADERBOARD_SIZE = 50
+# Key of the PostgreSQL advisory lock held by the running refresh
+REFRESH_LOCK_ID = 0x6c656164
+
+_scheduler = None
+
+
+def top_scores(board, window, lang='', now=None):
+    """Returns [(snippet id, score)] of the best public snippets, computed from the source tables"""
+    model, counter = BOARDS[board]
+    if WINDOWS[window] is None:
+        queryset = Snippet.objects.filter(is_private=False, **{f'{counter}__gt': 0})
+        if lang:
+            queryset = queryset.filter(lang_id=lang)
+        return list(queryset.order_by(f'-{counter}', 'id').values_list('id', counter)[:LEADERBOARD_SIZE])
+
+    since = (now or timezone.now()) - WINDOWS[window]
+    queryset = model.objects.filter(date__gte=since, snippet__is_private=False)
+    if lang:
+        queryset = queryset.filter(snippet__lang_id=lang)
+    return list(queryset.values('snippet_id')
+                        .annotate(score=Count('pk'))
+                        .order_by('-score', 'snippet_id')
+                        .values_list('snippet_id', 'score')[:LEADERBOARD_SIZE])
+
+
+def _try_lock():
+    """Takes the refresh lock until the end of the transaction, False if another refresh holds it"""
+    if connection.vendor != 'postgresql':
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', [REFRESH_LOCK_ID])
+        return cursor.fetchone()[0]
+
+
+def refresh_leaderboards(boards=None, windows=None, now=None, fresh_for=None):
+    """Recomputes the leaderboards and returns the number of stored entries. Returns None without
+    a refresh if another one is running or, with `fresh_for`, if one ran within that many seconds."""
+    now = now or timezone.now()
+    boards, windows = boards or list(BOARDS), windows or list(WINDOWS)
+    langs = [''] + supported_langs()
+    stored = 0
+    # Readers see either the old or the new leaderboards
+    with transaction.atomic():
+        if not _try_lock():
+            return None
+        if fresh_for and LeaderboardEntry.objects.filter(board__in=boards, window__in=windows,
+                                                         refreshed_at__gt=now - timedelta(seconds=fresh_for)).exists():
+            return None
+        for board in boards:
+            for window in windows:
+                entries = [
+                    LeaderboardEntry(board=board, window=window, lang=lang, rank=rank, snippet_id=snippet_id,
+                                     score=score, refreshed_at=now)
+                    for lang in langs
+                    for rank, (snippet_id, score) in enumerate(top_scores(board, window, lang, now), start=1)
+                ]
+                LeaderboardEntry.objects.filter(board=board, window=window).delete()
+                LeaderboardEntry.objects.bulk_create(entries)
+                stored += len(entries)
+    cache.delete(INDEX_PAGE_CACHE_KEY)
+    return stored
+
+
+def top_entries(board, window, lang='', limit=10):
+    # Snippets which went private since the refresh are left out
+    return (LeaderboardEntry.objects.filter(board=board, window=window, lang=lang, snippet__is_private=False)
+                                    .order_by('rank')
+                                    .values('rank', 'score',
+                                            name=F('snippet__name'),
+                                            slug=F('snippet__slug'),
+                                            snippet_lang=F('snippet__lang_id'),
+                                            author_name=F('snippet__author__username'))[:limit])
+
+
+def refresh_if_due(interval):
+    """Refreshes the leaderboards unless a worker has done it within the interval or is doing it"""
+    try:
+        return refresh_leaderboards(fresh_for=interval) is not None
+    except Exception:
+        logger.exception('Leaderboards refresh failed')
+        return False
+    finally:
+        # The thread has its own database connection
+        connection.close()
+
+
+def _refresh_periodically(interval):
+    while True:
+        time.sleep(interval)
+        refresh_if_due(interval)
+
+
+def start_scheduler(interval=None):
+    """Starts the refresh thread of this process once, if settings.LEADERBOARD_REFRESH_INTERVAL is set"""
+    global _scheduler
+    interval = interval or settings.LEADERBOARD_REFRESH_INTERVAL
+    if not interval or _scheduler is not None:
+        return _scheduler
+    _scheduler = threading.Thread(target=_refresh_periodically, args=(interval,), name='leaderboards',
+                                  daemon=True)
+    _scheduler.start()
+    return _scheduler
@@ -0,0 +1,15 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from MainApp.benchmark import cold_start
+
+
+class Command(BaseCommand):
+    help = 'Times the startup of new worker processes up to a loaded URLconf and prints it as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=10)
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(cold_start(options['runs']), indent=2))
@@ -0,0 +1,18 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from MainApp.benchmark import compare_connection_reuse
+
+
+class Command(BaseCommand):
+    help = ('Compares the per-request latency of a new database connection for every request '
+            'against a persistent connection and prints it as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--conn-max-age', type=int, default=60)
+
+    def handle(self, *args, **options):
+        result = compare_connection_reuse(options['requests'], options['conn_max_age'])
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,40 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from MainApp import benchmark
+
+
+class Command(BaseCommand):
+    help = ('Seeds the database up to every given number of snippets and times the hot endpoints, '
+            'printing latency percentiles, query counts and peak memory as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint and size')
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Time only this endpoint, may be repeated')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator')
+        parser.add_argument('--output', help='Write the report to this file instead of stdout')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded data instead of rolling it back')
+        parser.add_argument('--list-query', action='store_true',
+                            help='Also compare the list query run as prepared statements against plain ones')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            report = {'sizes': benchmark.run(options['sizes'], requests=options['requests'],
+                                             only=options['endpoints'], rng=random.Random(options['seed']))}
+            if options['list_query']:
+                report['list_query'] = benchmark.compare_list_query(options['requests'],
+                                                                    rng=random.Random(options['seed']))
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        report = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(report + '\n')
+        else:
+            self.stdout.write(report)
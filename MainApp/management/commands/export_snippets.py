@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from MainApp.bulk import FORMATS, export_chunks, export_rows, guess_format
+from MainApp.models import Snippet
+
+
+class Command(BaseCommand):
+    help = 'Exports snippets as NDJSON or as a gzipped tarball'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Output file, "-" for stdout')
+        parser.add_argument('--format', choices=FORMATS, help='Guessed from the file name by default')
+        parser.add_argument('--author', help='Export only the snippets of this user')
+        parser.add_argument('--public-only', action='store_true')
+
+    def handle(self, *args, **options):
+        queryset = Snippet.objects.all()
+        if options['author']:
+            queryset = queryset.filter(author__username=options['author'])
+        if options['public_only']:
+            queryset = queryset.filter(is_private=False)
+        export_format = options['format'] or guess_format(options['output'])
+
+        output = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        try:
+            for chunk in export_chunks(export_rows(queryset), export_format):
+                output.write(chunk)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
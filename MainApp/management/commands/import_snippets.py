@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from MainApp.bulk import BATCH_SIZE, FORMATS, guess_format, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Imports snippets from NDJSON or from a tarball made by export_snippets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input')
+        parser.add_argument('--format', choices=FORMATS, help='Guessed from the file name by default')
+        parser.add_argument('--author', help='Attribute all snippets to this user')
+        parser.add_argument('--default-author', help='Attribute snippets of unknown users to this user')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def get_user(self, username):
+        if not username:
+            return None
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f'User "{username}" does not exist')
+
+    def handle(self, *args, **options):
+        import_format = options['format'] or guess_format(options['input'])
+        with open(options['input'], 'rb') as fileobj:
+            result = import_rows(
+                read_rows(fileobj, import_format),
+                author=self.get_user(options['author']),
+                default_author=self.get_user(options['default_author']),
+                # Run by the site admins, who may add languages
+                create_langs=True,
+                batch_size=options['batch_size'],
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.created} snippets are imported, {result.skipped} are skipped, {result.invalid} are invalid'
+        ))
+        for error in result.errors:
+            self.stderr.write(error)
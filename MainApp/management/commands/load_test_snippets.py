@@ -0,0 +1,28 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from MainApp.benchmark import load_test
+
+DEFAULT_PATHS = [
+    '/ajax/snippet_non_private/json?start=0&length=10',
+    '/ajax/snippet_non_private/json?start=0&length=10&search[value]=print',
+]
+
+
+class Command(BaseCommand):
+    help = ('Load tests a running server, e.g. the WSGI and the ASGI deployment with the same number '
+            'of workers, and prints the throughput and latency percentiles as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help='e.g. http://localhost:8000')
+        parser.add_argument('--path', action='append', dest='paths', help='Path to request, may be repeated')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--cookie', help='Cookie header, e.g. a sessionid for the views of logged in users')
+
+    def handle(self, *args, **options):
+        urls = [options['base_url'].rstrip('/') + path for path in options['paths'] or DEFAULT_PATHS]
+        headers = {'Cookie': options['cookie']} if options['cookie'] else {}
+        result = load_test(urls, options['requests'], options['concurrency'], headers)
+        self.stdout.write(json.dumps(result, indent=2))
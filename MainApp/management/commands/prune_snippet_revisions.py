@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from MainApp.revisions import prune_revisions, snippets_with_revisions_over
+
+
+class Command(BaseCommand):
+    help = 'Drops old revisions of the snippets, keeping the newest ones of every snippet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=20, help='Revisions to keep per snippet')
+        parser.add_argument('--older-than', type=int, default=None,
+                            help='Drop only revisions older than this number of days')
+
+    def handle(self, *args, **options):
+        keep = max(options['keep'], 1)
+        before = None
+        if options['older_than'] is not None:
+            before = timezone.now() - timedelta(days=options['older_than'])
+        dropped = snippets = 0
+        for snippet_id in snippets_with_revisions_over(keep).iterator():
+            count = prune_revisions(snippet_id, keep, before)
+            dropped += count
+            snippets += bool(count)
+        self.stdout.write(self.style.SUCCESS(f'{dropped} revisions of {snippets} snippets are dropped'))
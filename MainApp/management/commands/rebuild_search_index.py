@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from MainApp.models import Snippet
+from MainApp.search import index_snippets
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of all snippets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch, indexed = [], 0
+        for snippet in Snippet.objects.select_related('code_blob').order_by('pk').iterator(chunk_size=options['batch_size']):
+            batch.append(snippet)
+            if len(batch) == options['batch_size']:
+                index_snippets(batch)
+                indexed += len(batch)
+                batch = []
+        index_snippets(batch)
+        indexed += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'{indexed} snippets are indexed'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from AJAX.models import SnippetLike
+from Comments.models import Comment
+from MainApp.models import Snippet
+
+
+def count_by_snippet(model):
+    return Coalesce(Subquery(
+        model.objects.filter(snippet=OuterRef('pk'))
+                     .order_by()
+                     .values('snippet')
+                     .annotate(count=Count('pk'))
+                     .values('count')
+    ), Value(0))
+
+
+class Command(BaseCommand):
+    help = 'Recalculates like_count and comment_count of all snippets'
+
+    def handle(self, *args, **options):
+        updated = Snippet.objects.update(
+            like_count=count_by_snippet(SnippetLike),
+            comment_count=count_by_snippet(Comment),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Counters of {updated} snippets are rebuilt'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from MainApp.leaderboards import BOARDS, WINDOWS, refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the day, week and all-time leaderboards of the snippets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', choices=list(BOARDS), action='append',
+                            help='Leaderboard to refresh, all of them by default')
+        parser.add_argument('--window', choices=list(WINDOWS), action='append',
+                            help='Time window to refresh, all of them by default')
+
+    def handle(self, *args, **options):
+        stored = refresh_leaderboards(options['board'], options['window'])
+        if stored is None:
+            self.stdout.write('Another refresh of the leaderboards is running')
+            return
+        self.stdout.write(self.style.SUCCESS(f'{stored} leaderboard entries are stored'))
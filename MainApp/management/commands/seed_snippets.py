@@ -0,0 +1,24 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from MainApp.benchmark import seed
+
+
+class Command(BaseCommand):
+    help = 'Adds generated users, snippets, comments and likes with long-tailed distributions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--snippets', type=int, default=2000)
+        parser.add_argument('--comments', type=int, default=6000)
+        parser.add_argument('--likes', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator')
+
+    def handle(self, *args, **options):
+        created = seed(users=options['users'], snippets=options['snippets'], comments=options['comments'],
+                       likes=options['likes'], rng=random.Random(options['seed']))
+        self.stdout.write(self.style.SUCCESS(
+            f'{created["users"]} users, {created["snippets"]} snippets, {created["comments"]} comments '
+            f'and up to {created["likes"]} likes are created'
+        ))
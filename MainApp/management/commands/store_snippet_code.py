@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from MainApp.blobs import BATCH_SIZE, delete_unused_blobs, move_from_blobs, move_to_blobs
+
+
+class Command(BaseCommand):
+    help = ('Moves the code of the existing snippets to the deduplicated compressed blobs or back to the rows '
+            'and deletes the blobs no snippet uses')
+
+    def add_arguments(self, parser):
+        parser.add_argument('direction', choices=('blobs', 'rows'))
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['direction'] == 'blobs':
+            moved = move_to_blobs(options['batch_size'])
+        else:
+            moved = move_from_blobs(options['batch_size'])
+        deleted = delete_unused_blobs()
+        self.stdout.write(self.style.SUCCESS(
+            f'Code of {moved} snippets is moved to the {options["direction"]}, {deleted} unused blobs are deleted'
+        ))
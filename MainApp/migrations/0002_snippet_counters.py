@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Snippet = apps.get_model('MainApp', 'Snippet')
+    SnippetLike = apps.get_model('AJAX', 'SnippetLike')
+    Comment = apps.get_model('Comments', 'Comment')
+
+    def count_by_snippet(model):
+        return Coalesce(Subquery(
+            model.objects.filter(snippet=OuterRef('pk'))
+                         .order_by()
+                         .values('snippet')
+                         .annotate(count=Count('pk'))
+                         .values('count')
+        ), Value(0))
+
+    Snippet.objects.update(
+        like_count=count_by_snippet(SnippetLike),
+        comment_count=count_by_snippet(Comment),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MainApp', '0001_initial'),
+        ('AJAX', '0001_initial'),
+        ('Comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='snippet',
+            name='like_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='snippet',
+            name='comment_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
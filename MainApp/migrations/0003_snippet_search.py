@@ -0,0 +1,47 @@
+# Generated by Django 4.1 on 2026-10-18 10:12
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS "MainApp_snippet_search_vector_gin" '
+            'ON "MainApp_snippet" USING gin (search_vector)'
+        )
+
+
+def drop_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "MainApp_snippet_search_vector_gin"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MainApp', '0002_snippet_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='snippet',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='SnippetSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('weight', models.FloatField()),
+                ('snippet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='MainApp.snippet')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='snippetsearchtoken',
+            index=models.Index(fields=['token', 'snippet'], name='MainApp_sni_token_95db45_idx'),
+        ),
+        migrations.RunPython(create_search_vector_index, drop_search_vector_index),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS "MainApp_snippet_name_trgm" '
+            'ON "MainApp_snippet" USING gin ("name" gin_trgm_ops)'
+        )
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS "MainApp_auth_user_username_trgm" '
+            'ON "auth_user" USING gin (username gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "MainApp_snippet_name_trgm"')
+        schema_editor.execute('DROP INDEX IF EXISTS "MainApp_auth_user_username_trgm"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MainApp', '0003_snippet_search'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MainApp', '0004_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='snippet',
+            index=models.Index(condition=models.Q(('is_private', False)), fields=['-creation_date', '-id'], name='snippet_public_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='snippet',
+            index=models.Index(fields=['author', '-creation_date', '-id'], name='snippet_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='snippet',
+            index=models.Index(condition=models.Q(('is_private', False), ('like_count__gt', 0)), fields=['-like_count'], name='snippet_top_liked_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='snippet',
+            index=models.Index(condition=models.Q(('comment_count__gt', 0), ('is_private', False)), fields=['-comment_count'], name='snippet_top_commented_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_updated_at(apps, schema_editor):
+    Snippet = apps.get_model('MainApp', 'Snippet')
+    Snippet.objects.update(updated_at=F('creation_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MainApp', '0005_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='snippet',
+            name='activity_date',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='snippet',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.1 on 2026-10-18 10:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('MainApp', '0006_snippet_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnippetRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('lang', models.CharField(max_length=25)),
+                ('size', models.PositiveIntegerField()),
+                ('base_number', models.PositiveIntegerField(null=True)),
+                ('data', models.BinaryField()),
+                ('author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('snippet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='MainApp.snippet')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='snippetrevision',
+            constraint=models.UniqueConstraint(fields=('snippet', 'number'), name='snippetrevision_unique_number'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1 on 2026-10-18 10:47
+
+import MainApp.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MainApp', '0007_snippet_revisions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='snippet',
+            name='code',
+            field=MainApp.models.CodeField(max_length=5000),
+        ),
+        migrations.AddField(
+            model_name='snippet',
+            name='code_blob',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='MainApp.codeblob'),
+        ),
+    ]
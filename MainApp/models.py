@@ -1,7 +1,14 @@
-from django.db import models
+import hashlib
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Q
+from django.db.models.query_utils import DeferredAttribute
 from django.contrib.auth.models import User
-from django.utils.text import slugify
-import datetime as dt
+
+from .compression import compress, decompress
+from .slugs import make_slug
 
 
 class SupportedLang(models.Model):
@@ -11,30 +18,209 @@ class SupportedLang(models.Model):
         return self.lang
 
 
+class CodeBlob(models.Model):
+    """Compressed code body stored once for all the snippets with the same code"""
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField()
+
+    @staticmethod
+    def make_digest(code):
+        return hashlib.sha256(code.encode()).hexdigest()
+
+    @classmethod
+    def store(cls, code):
+        # Call in a transaction: the row lock keeps delete_unused() off the blob until the snippet is saved
+        blob, _ = cls.objects.select_for_update(no_key=True).get_or_create(
+            digest=cls.make_digest(code), defaults={'data': compress(code), 'size': len(code)})
+        return blob
+
+    @classmethod
+    def delete_unused(cls, digests=None):
+        """
+        Deletes the blobs no snippet uses, only of `digests` when given, and returns
+        their number. The DELETE checks the references itself; when a snippet saved
+        meanwhile still gets one of the blobs, nothing is deleted until the next time.
+        """
+        quote = connection.ops.quote_name
+        blobs, snippets = quote(cls._meta.db_table), quote(Snippet._meta.db_table)
+        sql = (f'DELETE FROM {blobs} WHERE NOT EXISTS '
+               f'(SELECT 1 FROM {snippets} WHERE {snippets}.code_blob_id = {blobs}.digest)')
+        params = []
+        if digests is not None:
+            if not digests:
+                return 0
+            sql += f' AND {blobs}.digest IN ({", ".join(["%s"] * len(digests))})'
+            params = list(digests)
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.rowcount
+        except IntegrityError:
+            # The (deferred) foreign key of a snippet committed while the DELETE waited for its lock
+            return 0
+
+    @property
+    def code(self):
+        return decompress(self.data)
+
+
+class CodeAttribute(DeferredAttribute):
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if instance is not None and not value and instance.code_blob_id:
+            # The column is empty, the code is in the blob
+            value = instance.__dict__[self.field.attname] = instance.code_blob.code
+        return value
+
+    def __set__(self, instance, value):
+        # A data descriptor, so the empty column value in __dict__ does not hide __get__
+        if instance.__dict__.get(self.field.attname) != value:
+            instance._code_changed = True
+        instance.__dict__[self.field.attname] = value
+
+
+class CodeField(models.TextField):
+    """Snippet code which reads from the CodeBlob of the snippet when there is one
+    and leaves the column empty then"""
+    descriptor_class = CodeAttribute
+
+    def pre_save(self, model_instance, add):
+        if model_instance.code_blob_id:
+            return ''
+        return super().pre_save(model_instance, add)
+
+
 class Snippet(models.Model):
     name = models.CharField(max_length=100)
     lang = models.ForeignKey(SupportedLang, on_delete=models.CASCADE)
     description = models.CharField(max_length=250, default='')
-    code = models.TextField(max_length=5000)
+    code = CodeField(max_length=5000)
+    code_blob = models.ForeignKey(CodeBlob, on_delete=models.PROTECT, null=True, editable=False)
     creation_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_private = models.BooleanField()
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     slug = models.SlugField(unique=True, default=None, max_length=150)
+    like_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    comment_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    # Time of the last like, unlike, comment or comment deletion
+    activity_date = models.DateTimeField(null=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Listing of the public snippets, newest first
+            models.Index(fields=['-creation_date', '-id'], condition=Q(is_private=False),
+                         name='snippet_public_created_idx'),
+            # Snippets of one author
+            models.Index(fields=['author', '-creation_date', '-id'], name='snippet_author_created_idx'),
+            # Top tens of the index page
+            models.Index(fields=['-like_count'], condition=Q(is_private=False, like_count__gt=0),
+                         name='snippet_top_liked_idx'),
+            models.Index(fields=['-comment_count'], condition=Q(is_private=False, comment_count__gt=0),
+                         name='snippet_top_commented_idx'),
+        ]
+
+    # Set by CodeAttribute, save() hashes and compresses the code again only when it is changed
+    _code_changed = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._code_changed = False
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = '_'.join((slugify(self.name), dt.datetime.now().strftime('%d-%m-%y-%H-%M-%S')))
-        super().save(*args, **kwargs)
+            self.slug = self.make_slug(self.name)
+        previous_blob_id = self.code_blob_id
+        with transaction.atomic():
+            if self._code_changed or bool(previous_blob_id) != settings.SNIPPETS_CODE_BLOBS:
+                # The code is read before code_blob changes, it may still be in the old blob
+                code = self.code
+                self.code_blob = CodeBlob.store(code) if settings.SNIPPETS_CODE_BLOBS else None
+            super().save(*args, **kwargs)
+        self._code_changed = False
+        if previous_blob_id and previous_blob_id != self.code_blob_id:
+            transaction.on_commit(lambda: CodeBlob.delete_unused([previous_blob_id]))
+
+    @property
+    def last_modified(self):
+        return max(filter(None, (self.updated_at, self.activity_date)))
 
-    def to_dict_json(self):
-        return {
+    @staticmethod
+    def make_slug(name):
+        return make_slug(name)
+
+    def to_dict_json(self, detailed=False):
+        """Select the author (and the code blob when detailed) along, the dict reads no other row"""
+        data = {
             'name': self.name,
-            'lang': self.lang.lang,
+            'lang': self.lang_id,
             'creation_date': str(self.creation_date),
             'author': self.author.username,
-            'like_count': self.snippetlike_set.count(),
-            'comment_count': self.comment_set.count(),
+            'like_count': self.like_count,
+            'comment_count': self.comment_count,
             'is_private': self.is_private,
             'slug': self.slug,
         }
+        if detailed:
+            data.update({
+                'id': self.id,
+                'description': self.description,
+                'code': self.code,
+                'updated_at': str(self.updated_at),
+            })
+        return data
+
+
+class SnippetRevision(models.Model):
+    """Past code of a snippet: a zlib-compressed full copy (snapshot) or a delta
+    against the snapshot of base_number, see MainApp.revisions"""
+    snippet = models.ForeignKey(Snippet, on_delete=models.CASCADE, related_name='revisions')
+    number = models.PositiveIntegerField()
+    author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    lang = models.CharField(max_length=25)
+    size = models.PositiveIntegerField()
+    # None for a snapshot
+    base_number = models.PositiveIntegerField(null=True)
+    data = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['snippet', 'number'], name='snippetrevision_unique_number'),
+        ]
+
+    @property
+    def is_snapshot(self):
+        return self.base_number is None
+
+
+class LeaderboardEntry(models.Model):
+    """One place of a precomputed top list, see MainApp.leaderboards"""
+    board = models.CharField(max_length=10)
+    window = models.CharField(max_length=10)
+    # Empty for the leaderboard of all languages
+    lang = models.CharField(max_length=25, blank=True)
+    rank = models.PositiveSmallIntegerField()
+    snippet = models.ForeignKey(Snippet, on_delete=models.CASCADE, related_name='+')
+    score = models.PositiveIntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            # Top N of a leaderboard is a range of this index
+            models.UniqueConstraint(fields=['board', 'window', 'lang', 'rank'], name='leaderboard_unique_rank'),
+        ]
+
+
+class SnippetSearchToken(models.Model):
+    snippet = models.ForeignKey(Snippet, on_delete=models.CASCADE)
+    token = models.CharField(max_length=100)
+    weight = models.FloatField()
 
+    class Meta:
+        indexes = [models.Index(fields=['token', 'snippet'])]
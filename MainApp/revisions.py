@@ -0,0 +1,140 @@
+"""
+Edit history of the snippet code. A revision is stored either as a full
+zlib-compressed copy of the code (a snapshot) or as a compressed line delta
+against the latest snapshot, so rebuilding any revision reads at most two rows.
+A new snapshot is taken every SNAPSHOT_INTERVAL revisions or when the delta
+stops being much smaller than the compressed code.
+"""
+import difflib
+import json
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .compression import compress, decompress
+from .models import Snippet, SnippetRevision
+
+# Revisions sharing one snapshot, the snapshot included
+SNAPSHOT_INTERVAL = 10
+# A delta bigger than this share of the compressed code is stored as a snapshot instead
+MAX_DELTA_RATIO = 0.5
+
+
+def make_delta(base, code):
+    """Returns the compressed list of [first, last] line ranges copied from base and inserted texts"""
+    base_lines, lines = base.splitlines(keepends=True), code.splitlines(keepends=True)
+    operations = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, base_start, base_end, start, end in matcher.get_opcodes():
+        if tag == 'equal':
+            operations.append([base_start, base_end])
+        elif start != end:
+            operations.append(''.join(lines[start:end]))
+    return compress(json.dumps(operations, ensure_ascii=False, separators=(',', ':')))
+
+
+def apply_delta(base, delta):
+    base_lines = base.splitlines(keepends=True)
+    return ''.join(
+        ''.join(base_lines[operation[0]:operation[1]]) if isinstance(operation, list) else operation
+        for operation in json.loads(decompress(delta))
+    )
+
+
+def encode(code, number, snapshot=None, snapshot_code=None):
+    """Returns (base_number, data) of revision `number` given the current snapshot and its code"""
+    full = compress(code)
+    if snapshot is not None and number - snapshot.number < SNAPSHOT_INTERVAL:
+        delta = make_delta(snapshot_code, code)
+        if len(delta) < len(full) * MAX_DELTA_RATIO:
+            return snapshot.number, delta
+    return None, full
+
+
+def _add_revision(snippet, number, code, lang, author_id, snapshot=None, snapshot_code=None):
+    base_number, data = encode(code, number, snapshot, snapshot_code)
+    return SnippetRevision.objects.create(snippet=snippet, number=number, author_id=author_id, lang=lang,
+                                          size=len(code), base_number=base_number, data=data)
+
+
+def record_revision(snippet, author_id=None, previous=None):
+    """Adds the current code of the snippet to its history. `previous` is the (code, lang)
+    the snippet had before the edit, it becomes the first revision of a snippet without one."""
+    with transaction.atomic():
+        # Concurrent edits of the snippet take the next number one after another
+        Snippet.objects.select_for_update().filter(pk=snippet.pk).values_list('pk').get()
+        latest = snippet.revisions.defer('data').order_by('-number').first()
+        if latest is None and previous is not None and previous != (snippet.code, snippet.lang_id):
+            latest = _add_revision(snippet, 1, previous[0], previous[1], snippet.author_id)
+        if latest is None:
+            return _add_revision(snippet, 1, snippet.code, snippet.lang_id, author_id)
+
+        snapshot = snippet.revisions.get(number=latest.base_number or latest.number)
+        return _add_revision(snippet, latest.number + 1, snippet.code, snippet.lang_id, author_id,
+                             snapshot, decompress(snapshot.data))
+
+
+def revision_list(snippet):
+    """Revisions of the snippet, newest first, without their code"""
+    return (snippet.revisions.order_by('-number')
+                             .values('number', 'created_at', 'lang', 'size', author_name=F('author__username')))
+
+
+def revision_code(revision, snapshot=None):
+    if revision.is_snapshot:
+        return decompress(revision.data)
+    if snapshot is None:
+        snapshot = SnippetRevision.objects.get(snippet_id=revision.snippet_id, number=revision.base_number)
+    return apply_delta(decompress(snapshot.data), revision.data)
+
+
+def get_revision(snippet, number):
+    """Returns the revision with its rebuilt code in the `code` attribute"""
+    revision = snippet.revisions.get(number=number)
+    revision.code = revision_code(revision)
+    return revision
+
+
+def prune_revisions(snippet_id, keep, before=None):
+    """Drops all but the `keep` newest revisions of the snippet (only the ones created before
+    `before` if it is given). Kept deltas of a dropped snapshot are encoded again against
+    a kept one. Returns the number of dropped revisions."""
+    with transaction.atomic():
+        revisions = list(SnippetRevision.objects.select_for_update()
+                                                .filter(snippet_id=snippet_id).order_by('number'))
+        dropped = []
+        for revision in revisions[:max(len(revisions) - keep, 0)]:
+            if before is not None and revision.created_at >= before:
+                break
+            dropped.append(revision)
+        if not dropped:
+            return 0
+
+        by_number = {revision.number: revision for revision in revisions}
+        dropped_numbers = {revision.number for revision in dropped}
+        kept = revisions[len(dropped):]
+        codes = {
+            revision.number: revision_code(revision, by_number.get(revision.base_number))
+            for revision in kept if revision.base_number in dropped_numbers
+        }
+
+        snapshot, changed = None, []
+        for revision in kept:
+            if revision.number in codes:
+                snapshot_code = decompress(snapshot.data) if snapshot is not None else None
+                revision.base_number, revision.data = encode(codes[revision.number], revision.number,
+                                                             snapshot, snapshot_code)
+                changed.append(revision)
+            if revision.is_snapshot:
+                snapshot = revision
+
+        SnippetRevision.objects.filter(pk__in=[revision.pk for revision in dropped]).delete()
+        SnippetRevision.objects.bulk_update(changed, ['base_number', 'data'])
+        return len(dropped)
+
+
+def snippets_with_revisions_over(keep):
+    return (SnippetRevision.objects.values('snippet_id')
+                                   .annotate(count=Count('pk'))
+                                   .filter(count__gt=keep)
+                                   .values_list('snippet_id', flat=True))
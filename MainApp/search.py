@@ -0,0 +1,134 @@
+"""
+Full-text search over snippets. PostgreSQL keeps the documents in the GIN-indexed
+search_vector column, other databases in the SnippetSearchToken table.
+"""
+import re
+from collections import namedtuple
+
+from django.contrib.auth.models import User
+from django.db import connection
+
+from .models import SnippetSearchToken
+
+WORD_RE = re.compile(r'\w+')
+IDENTIFIER_PART_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\W\d_A-Za-z]+')
+MAX_TOKEN_LENGTH = SnippetSearchToken._meta.get_field('token').max_length
+
+# Same weights as the default ones of PostgreSQL ts_rank()
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+SearchSQL = namedtuple('SearchSQL', ['where', 'where_params', 'rank', 'rank_params'])
+
+
+def split_identifier(word):
+    return [part.lower() for chunk in word.split('_') for part in IDENTIFIER_PART_RE.findall(chunk)]
+
+
+def tokenize(text):
+    """Yields the lowercased words of the text followed by their camelCase / snake_case parts"""
+    for word in WORD_RE.findall(text or ''):
+        yield word.lower()[:MAX_TOKEN_LENGTH]
+        parts = split_identifier(word)
+        if len(parts) > 1:
+            for part in parts:
+                yield part[:MAX_TOKEN_LENGTH]
+
+
+def query_terms(query):
+    """Every word of a query is matched by its identifier parts, so "getUser" finds get_user too"""
+    terms = []
+    for word in WORD_RE.findall(query or ''):
+        for term in split_identifier(word) or [word.lower()]:
+            if term not in terms:
+                terms.append(term[:MAX_TOKEN_LENGTH])
+    return terms
+
+
+def snippet_document(snippet, author_name):
+    return {
+        'A': ' '.join(tokenize(snippet.name)),
+        'B': ' '.join(tokenize(snippet.description)),
+        'C': ' '.join(tokenize(f'{snippet.lang_id} {author_name}')),
+        'D': ' '.join(tokenize(snippet.code)),
+    }
+
+
+def documents(snippets):
+    author_names = dict(
+        User.objects.filter(pk__in={snippet.author_id for snippet in snippets}).values_list('pk', 'username')
+    )
+    for snippet in snippets:
+        yield snippet, snippet_document(snippet, author_names.get(snippet.author_id, ''))
+
+
+class PostgresSearchBackend:
+    def index(self, snippets):
+        sql = '''
+        UPDATE "MainApp_snippet" SET search_vector =
+            setweight(to_tsvector('simple', %s), 'A') ||
+            setweight(to_tsvector('simple', %s), 'B') ||
+            setweight(to_tsvector('simple', %s), 'C') ||
+            setweight(to_tsvector('simple', %s), 'D')
+        WHERE id = %s
+        '''
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [
+                (document['A'], document['B'], document['C'], document['D'], snippet.pk)
+                for snippet, document in documents(snippets)
+            ])
+
+    def search_sql(self, terms, alias='s'):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return SearchSQL(
+            where=f"{alias}.search_vector @@ to_tsquery('simple', %s)",
+            where_params=[tsquery],
+            rank=f"ts_rank({alias}.search_vector, to_tsquery('simple', %s))",
+            rank_params=[tsquery],
+        )
+
+
+class TokenTableSearchBackend:
+    def index(self, snippets):
+        snippets = list(snippets)
+        SnippetSearchToken.objects.filter(snippet__in=snippets).delete()
+        tokens = []
+        for snippet, document in documents(snippets):
+            weights = {}
+            for weight in 'DCBA':
+                for token in document[weight].split():
+                    weights[token] = WEIGHTS[weight]
+            tokens += [SnippetSearchToken(snippet=snippet, token=token, weight=weight)
+                       for token, weight in weights.items()]
+        SnippetSearchToken.objects.bulk_create(tokens, batch_size=500)
+
+    def search_sql(self, terms, alias='s'):
+        # Prefix matches are written as ranges, so the (token, snippet) index can serve them
+        ranges, params = [], []
+        for term in terms:
+            ranges.append('(t.token >= %s AND t.token < %s)')
+            params += [term, term[:-1] + chr(ord(term[-1]) + 1)]
+        where = ' AND '.join(
+            f'{alias}.id IN (SELECT t.snippet_id FROM "MainApp_snippetsearchtoken" AS t WHERE {term_range})'
+            for term_range in ranges
+        )
+        rank = f'''(SELECT SUM(t.weight) FROM "MainApp_snippetsearchtoken" AS t
+                    WHERE t.snippet_id = {alias}.id AND ({' OR '.join(ranges)}))'''
+        return SearchSQL(where=where, where_params=list(params), rank=rank, rank_params=list(params))
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return TokenTableSearchBackend()
+
+
+def index_snippets(snippets):
+    get_backend().index(snippets)
+
+
+def search_sql(query, alias='s'):
+    """Returns SQL fragments matching and ranking the snippets aliased as `alias`, or None for an empty query"""
+    terms = query_terms(query)
+    if not terms:
+        return None
+    return get_backend().search_sql(terms, alias)
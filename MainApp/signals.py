@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from MainApp.cache import invalidate_index_page
+from MainApp.langs import invalidate_langs
+from MainApp.models import CodeBlob, Snippet, SupportedLang
+from MainApp.search import index_snippets
+from MainApp.trigram import update_fallback_index
+
+
+@receiver(post_save, sender=Snippet)
+@receiver(post_delete, sender=Snippet)
+def snippet_changed(sender, instance, **kwargs):
+    invalidate_index_page()
+
+
+@receiver(post_save, sender=Snippet)
+def update_search_index(sender, instance, raw, **kwargs):
+    if not raw:
+        index_snippets([instance])
+        update_fallback_index(instance)
+
+
+@receiver(post_delete, sender=Snippet)
+def remove_from_trigram_index(sender, instance, **kwargs):
+    update_fallback_index(instance, deleted=True)
+
+
+@receiver(post_delete, sender=Snippet)
+def delete_unused_blob(sender, instance, **kwargs):
+    if instance.code_blob_id:
+        transaction.on_commit(lambda: CodeBlob.delete_unused([instance.code_blob_id]))
+
+
+@receiver(post_save, sender=SupportedLang)
+@receiver(post_delete, sender=SupportedLang)
+def supported_lang_changed(sender, instance, **kwargs):
+    invalidate_langs()
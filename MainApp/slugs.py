@@ -0,0 +1,39 @@
+"""
+Snippet slugs are "<slugified name>_<id>", where the id is 50 bits of milliseconds
+since the epoch followed by 40 random bits. Ids of one process are strictly
+increasing, and ids of different processes collide only if they are made in the
+same millisecond with the same 40 random bits, so slugs never have to be retried.
+"""
+import secrets
+import threading
+import time
+
+from django.utils.text import slugify
+
+ALPHABET = '0123456789abcdefghjkmnpqrstvwxyz'
+TIME_BITS, RANDOM_BITS = 50, 40
+MAX_NAME_LENGTH = 100
+
+_lock = threading.Lock()
+_last_id = 0
+
+
+def encode(number, length):
+    chars = []
+    for _ in range(length):
+        number, index = divmod(number, 32)
+        chars.append(ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
+def next_id():
+    global _last_id
+    with _lock:
+        new_id = (time.time_ns() // 1_000_000) << RANDOM_BITS | secrets.randbits(RANDOM_BITS)
+        # A clock which stands still or goes back must not repeat ids
+        _last_id = max(new_id, _last_id + 1)
+        return encode(_last_id, (TIME_BITS + RANDOM_BITS) // 5)
+
+
+def make_slug(name):
+    return f'{slugify(name)[:MAX_NAME_LENGTH].strip("-_") or "snippet"}_{next_id()}'
@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from MainApp.bulk import export_rows, import_rows
+from MainApp.models import CodeBlob, Snippet, SupportedLang
+
+
+@override_settings(SNIPPETS_CODE_BLOBS=True)
+class CodeBlobTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='Python')
+
+    def create_snippet(self, name, code):
+        return Snippet.objects.create(name=name, lang=self.lang, code=code, is_private=False, author=self.user)
+
+    def test_same_code_is_stored_once(self):
+        first = self.create_snippet('First', 'print("Test code")\n' * 20)
+        second = self.create_snippet('Second', 'print("Test code")\n' * 20)
+        self.assertEqual(CodeBlob.objects.count(), 1)
+        self.assertEqual(first.code_blob_id, second.code_blob_id)
+        self.assertEqual(Snippet.objects.filter(code='').count(), 2)
+        self.assertLess(len(CodeBlob.objects.get().data), len(first.code))
+
+    def test_code_is_read_from_blob(self):
+        snippet = self.create_snippet('First', 'print("Test code")')
+        self.assertEqual(Snippet.objects.get(pk=snippet.pk).code, 'print("Test code")')
+        snippet = Snippet.objects.select_related('code_blob').get(pk=snippet.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(snippet.code, 'print("Test code")')
+
+    def test_changed_code_gets_new_blob(self):
+        snippet = self.create_snippet('First', 'print("Test code")')
+        snippet.code = 'len("Test code")'
+        snippet.save()
+        self.assertEqual(Snippet.objects.get(pk=snippet.pk).code, 'len("Test code")')
+        self.assertEqual(CodeBlob.objects.count(), 2)
+
+    def test_detail_page_and_export_read_blob(self):
+        snippet = self.create_snippet('First', 'print("Test code")')
+        response = self.client.get(reverse('snippet_detail_page', kwargs={'slug': snippet.slug}))
+        self.assertContains(response, '<span class="nb">print</span>', html=False)
+        self.assertEqual([row['code'] for row in export_rows(Snippet.objects.all())], ['print("Test code")'])
+
+    def test_import_stores_blobs(self):
+        import_rows([{'name': 'Imported', 'lang': 'Python', 'code': 'a = 1'}] * 2, author=self.user)
+        self.assertEqual(CodeBlob.objects.count(), 1)
+        self.assertEqual([snippet.code for snippet in Snippet.objects.all()], ['a = 1', 'a = 1'])
+
+    def test_store_snippet_code_command(self):
+        with override_settings(SNIPPETS_CODE_BLOBS=False):
+            first = self.create_snippet('First', 'print("Test code")')
+            self.create_snippet('Second', 'print("Test code")')
+        self.assertEqual(CodeBlob.objects.count(), 0)
+
+        out = StringIO()
+        call_command('store_snippet_code', 'blobs', stdout=out)
+        self.assertIn('Code of 2 snippets is moved to the blobs', out.getvalue())
+        self.assertEqual(Snippet.objects.filter(code='', code_blob__isnull=False).count(), 2)
+        moved = Snippet.objects.get(pk=first.pk)
+        self.assertEqual(moved.code, 'print("Test code")')
+        self.assertEqual(moved.updated_at, first.updated_at)
+
+        call_command('store_snippet_code', 'rows', stdout=out)
+        self.assertEqual(Snippet.objects.filter(code='print("Test code")', code_blob=None).count(), 2)
+        self.assertEqual(CodeBlob.objects.count(), 0)
+
+    def test_unchanged_code_is_not_stored_again(self):
+        snippet = Snippet.objects.get(pk=self.create_snippet('First', 'print("Test code")').pk)
+        snippet.code = snippet.code
+        snippet.name = 'Renamed'
+        with CaptureQueriesContext(connection) as queries:
+            snippet.save()
+        self.assertFalse([query for query in queries.captured_queries if 'codeblob' in query['sql']])
+
+    def test_edit_and_delete_remove_unused_blobs(self):
+        snippet = self.create_snippet('First', 'print("Test code")')
+        self.create_snippet('Second', 'len("Test code")')
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.code = 'len("Test code")'
+            snippet.save()
+        self.assertEqual(CodeBlob.objects.count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.delete()
+        self.assertEqual(CodeBlob.objects.count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Snippet.objects.all().delete()
+        self.assertEqual(CodeBlob.objects.count(), 0)
+
+    def test_blobs_in_use_are_not_deleted(self):
+        snippet = self.create_snippet('First', 'print("Test code")')
+        CodeBlob.store('unused')
+        self.assertEqual(CodeBlob.delete_unused([snippet.code_blob_id]), 0)
+        self.assertEqual(CodeBlob.delete_unused(), 1)
+        self.assertEqual(list(CodeBlob.objects.values_list('digest', flat=True)), [snippet.code_blob_id])
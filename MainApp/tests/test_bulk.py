@@ -0,0 +1,112 @@
+import io
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth.models import User
+
+from MainApp.bulk import export_chunks, export_rows, import_rows, read_rows
+from MainApp.models import Snippet, SupportedLang
+
+
+class BulkExportImportTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user('TestUser')
+        self.other_user = User.objects.create_user('OtherUser')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        for snippet_num in range(3):
+            Snippet.objects.create(
+                name=f'Test Snippet {snippet_num}',
+                lang=self.lang,
+                code=f'print({snippet_num})',
+                is_private=snippet_num == 0,
+                author=self.user
+            )
+
+    def export(self, export_format):
+        return io.BytesIO(b''.join(export_chunks(export_rows(Snippet.objects.all()), export_format)))
+
+    def test_ndjson_round_trip(self):
+        archive = self.export('ndjson')
+        self.assertEqual(len(archive.getvalue().splitlines()), 3)
+        rows = list(read_rows(archive, 'ndjson'))
+        self.assertEqual([row['name'] for row in rows], [f'Test Snippet {num}' for num in range(3)])
+        self.assertEqual(rows[0]['author'], 'TestUser')
+        self.assertTrue(rows[0]['is_private'])
+
+    def test_tar_round_trip(self):
+        rows = list(read_rows(self.export('tar'), 'tar'))
+        self.assertEqual([row['code'] for row in rows], [f'print({num})' for num in range(3)])
+
+    def test_import_keeps_free_slugs(self):
+        rows = list(read_rows(self.export('ndjson'), 'ndjson'))
+        Snippet.objects.all().delete()
+        result = import_rows(rows)
+        self.assertEqual(result.created, 3)
+        self.assertEqual(
+            sorted(Snippet.objects.values_list('slug', flat=True)),
+            sorted(row['slug'] for row in rows)
+        )
+
+    def test_import_makes_unique_slugs(self):
+        rows = list(read_rows(self.export('ndjson'), 'ndjson'))
+        import_rows(rows + rows, batch_size=2)
+        self.assertEqual(Snippet.objects.count(), 9)
+        self.assertEqual(Snippet.objects.values('slug').distinct().count(), 9)
+
+    def test_import_same_names_without_slugs(self):
+        rows = [{'name': 'Same', 'lang': 'NewLang', 'code': 'pass', 'author': 'OtherUser'}] * 50
+        result = import_rows(rows, create_langs=True, batch_size=20)
+        self.assertEqual(result.created, 50)
+        self.assertEqual(Snippet.objects.filter(author=self.other_user).values('slug').distinct().count(), 50)
+        self.assertTrue(SupportedLang.objects.filter(lang='NewLang').exists())
+
+    def test_import_resolves_authors(self):
+        rows = [
+            {'name': 'Known', 'lang': 'TestLang', 'code': 'pass', 'author': 'OtherUser'},
+            {'name': 'Unknown', 'lang': 'TestLang', 'code': 'pass', 'author': 'Nobody'},
+        ]
+        result = import_rows(rows)
+        self.assertEqual((result.created, result.skipped), (1, 1))
+        result = import_rows(rows, default_author=self.user)
+        self.assertEqual((result.created, result.skipped), (2, 0))
+        self.assertEqual(Snippet.objects.get(slug__startswith='unknown').author, self.user)
+
+    def test_import_restores_dates_and_privacy(self):
+        Snippet.objects.filter(is_private=True).update(creation_date=timezone.now() - timedelta(days=30))
+        dates = dict(Snippet.objects.values_list('slug', 'creation_date'))
+        rows = list(read_rows(self.export('ndjson'), 'ndjson'))
+        Snippet.objects.all().delete()
+        import_rows(rows)
+        for slug, creation_date in Snippet.objects.values_list('slug', 'creation_date'):
+            # The export keeps milliseconds
+            self.assertAlmostEqual(creation_date, dates[slug], delta=timedelta(milliseconds=1))
+        self.assertEqual(list(Snippet.objects.filter(is_private=True).values_list('slug', flat=True)),
+                         [rows[0]['slug']])
+
+    def test_import_rejects_bad_rows(self):
+        row = {'name': 'TestName', 'lang': 'TestLang', 'code': 'pass', 'author': 'TestUser'}
+        rows = [
+            {**row, 'is_private': 'false'},
+            {**row, 'is_private': 'True'},
+            {**row, 'name': 'x' * 101},
+            {**row, 'lang': 'x' * 26},
+            {**row, 'code': ''},
+            {**row, 'is_private': 'maybe'},
+            {**row, 'creation_date': 'yesterday'},
+            {**row, 'lang': 'UnknownLang'},
+            ['not', 'a', 'snippet'],
+        ]
+        Snippet.objects.all().delete()
+        result = import_rows(rows)
+        self.assertEqual((result.created, result.invalid), (2, 7))
+        self.assertEqual(result.errors[0], 'Row 3: name is longer than 100 characters')
+        self.assertEqual(result.errors[-1], 'Row 8: unknown language "UnknownLang"')
+        self.assertEqual(list(Snippet.objects.order_by('id').values_list('is_private', flat=True)), [False, True])
+        self.assertFalse(SupportedLang.objects.filter(lang='UnknownLang').exists())
+
+    def test_import_broken_after_a_batch_creates_nothing(self):
+        archive = io.BytesIO(b''.join(export_chunks(export_rows(Snippet.objects.all()), 'ndjson')) + b'{not json\n')
+        with self.assertRaises(ValueError):
+            import_rows(read_rows(archive, 'ndjson'), batch_size=2)
+        self.assertEqual(Snippet.objects.count(), 3)
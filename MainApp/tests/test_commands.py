@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import LiveServerTestCase, TestCase, TransactionTestCase
+from django.contrib.auth.models import User
+
+from AJAX.models import SnippetLike
+from Comments.models import Comment
+from MainApp.models import Snippet, SupportedLang
+
+
+class RebuildSnippetCountersCommandTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user('TestUser')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='Test Snippet 1',
+            lang=self.lang,
+            code='print("Test code")',
+            is_private=False,
+            author=self.user
+        )
+        SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+        Comment.objects.create(snippet=self.snippet, author=self.user, text='Test text')
+        Comment.objects.create(snippet=self.snippet, author=self.user, text='Test text')
+
+    def test_counters_are_rebuilt(self):
+        Snippet.objects.update(like_count=10, comment_count=0)
+        call_command('rebuild_snippet_counters', stdout=StringIO())
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.like_count, 1)
+        self.assertEqual(self.snippet.comment_count, 2)
+
+
+class ExportImportSnippetsCommandTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user('TestUser')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        for snippet_num in range(5):
+            Snippet.objects.create(
+                name=f'Test Snippet {snippet_num}',
+                lang=self.lang,
+                code='print("Test code")',
+                is_private=False,
+                author=self.user
+            )
+
+    def test_export_and_import(self):
+        for file_name in ('snippets.ndjson', 'snippets.tar.gz'):
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, file_name)
+                call_command('export_snippets', path, stdout=StringIO())
+                Snippet.objects.all().delete()
+                out = StringIO()
+                call_command('import_snippets', path, stdout=out)
+                self.assertIn('5 snippets are imported', out.getvalue())
+                self.assertEqual(Snippet.objects.count(), 5)
+
+
+class SeedSnippetsCommandTest(TestCase):
+    def test_objects_are_seeded(self):
+        call_command('seed_snippets', users=5, snippets=40, comments=60, likes=80, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Snippet.objects.count(), 40)
+        self.assertEqual(Comment.objects.count(), 60)
+        self.assertTrue(SnippetLike.objects.exists())
+        self.assertEqual(sum(Snippet.objects.values_list('like_count', flat=True)), SnippetLike.objects.count())
+
+
+class BenchmarkSnippetsCommandTest(TestCase):
+    def test_report(self):
+        output = StringIO()
+        call_command('benchmark_snippets', sizes=[20, 40], requests=3, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual([size['snippets'] for size in report['sizes']], [20, 40])
+        endpoints = report['sizes'][-1]['endpoints']
+        self.assertEqual(set(endpoints), {'index', 'snippet_detail', 'snippets_json', 'user_snippets_json',
+                                          'switch_snippetlike', 'create_comment'})
+        for timing in endpoints.values():
+            self.assertIn(timing['status'], (200, 302))
+            self.assertGreater(timing['latency_ms']['p50'], 0)
+            self.assertGreater(timing['peak_memory_kb'], 0)
+        # The seeded data is rolled back
+        self.assertFalse(Snippet.objects.exists())
+
+
+class LoadTestSnippetsCommandTest(LiveServerTestCase):
+    def test_report(self):
+        output = StringIO()
+        # The threads of the live server share one in-memory SQLite connection, so the clients go one by one
+        call_command('load_test_snippets', self.live_server_url, requests=20, concurrency=1, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['statuses'], {'200': 20})
+        self.assertGreater(report['requests_per_second'], 0)
+
+
+class BenchmarkConnectionsCommandTest(TransactionTestCase):
+    def test_report(self):
+        conn_max_age = connection.settings_dict['CONN_MAX_AGE']
+        output = StringIO()
+        call_command('benchmark_connections', requests=5, conn_max_age=30, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(set(report), {'vendor', 'conn_max_age_0', 'conn_max_age_30'})
+        self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], conn_max_age)
+
+
+class BenchmarkColdStartCommandTest(TestCase):
+    def test_startup_does_not_query_database(self):
+        output = StringIO()
+        call_command('benchmark_cold_start', runs=1, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertFalse(report['connects_to_database'])
+        self.assertEqual(report['runs'], 1)
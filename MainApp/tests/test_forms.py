@@ -1,5 +1,14 @@
+import time
+from unittest import mock
+
+from django.conf import settings
 from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
 from MainApp.forms import SnippetForm
+from MainApp.langs import supported_langs
+from MainApp.models import Snippet, SupportedLang
 
 
 class SnippetFormTest(TestCase):
@@ -18,3 +27,43 @@ class SnippetFormTest(TestCase):
     def test_snippet_form_is_private_field_label(self):
         form = SnippetForm()
         self.assertTrue(form.fields['is_private'].label == 'Приватный')
+
+
+class SnippetFormLangTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        SupportedLang.objects.create(lang='Python')
+
+    def test_lang_choices_are_cached(self):
+        self.assertEqual(supported_langs(), ['Python'])
+        with self.assertNumQueries(0):
+            choices = list(SnippetForm().fields['lang'].choices)
+        self.assertEqual(choices, [('', ''), ('Python', 'Python')])
+
+    def test_lang_choices_follow_changes(self):
+        supported_langs()
+        SupportedLang.objects.create(lang='Go')
+        self.assertEqual(list(SnippetForm().fields['lang'].choices), [('', ''), ('Go', 'Go'), ('Python', 'Python')])
+        SupportedLang.objects.get(lang='Python').delete()
+        self.assertEqual(list(SnippetForm().fields['lang'].choices), [('', ''), ('Go', 'Go')])
+
+    def test_lang_choices_expire(self):
+        supported_langs()
+        # Added by another worker, whose signal only reaches its own cache
+        SupportedLang.objects.bulk_create([SupportedLang(lang='Go')])
+        self.assertEqual(supported_langs(), ['Python'])
+        later = time.time() + settings.SUPPORTED_LANGS_CACHE_TIMEOUT + 1
+        with mock.patch('time.time', return_value=later):
+            self.assertEqual(supported_langs(), ['Go', 'Python'])
+
+    def test_form_saves_lang(self):
+        user = User.objects.create_user(username='TestUser')
+        form = SnippetForm({'name': 'TestName', 'lang': 'Python', 'code': 'a = 1'})
+        form.instance.author = user
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().lang_id, 'Python')
+        self.assertEqual(Snippet.objects.get().lang_id, 'Python')
+
+    def test_unknown_lang_is_invalid(self):
+        form = SnippetForm({'name': 'TestName', 'lang': 'Unknown', 'code': 'a = 1'})
+        self.assertIn('lang', form.errors)
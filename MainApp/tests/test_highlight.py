@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from MainApp.highlight import get_lexer, highlight_cache_key, highlighted_code
+from MainApp.models import Snippet, SupportedLang
+
+
+class HighlightTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_lexer_by_lang(self):
+        self.assertEqual(get_lexer('Python').name, 'Python')
+        self.assertEqual(get_lexer('C++').name, 'C++')
+        self.assertEqual(get_lexer('Unknown Lang').name, 'Text only')
+
+    def test_code_is_escaped(self):
+        html = highlighted_code('<script>alert(1)</script>', 'Unknown Lang')
+        self.assertNotIn('<script>', html)
+
+    def test_highlighted_code_is_cached(self):
+        html = highlighted_code('print("Test code")', 'Python')
+        self.assertIn('<span class="nb">print</span>', html)
+        self.assertEqual(cache.get(highlight_cache_key('print("Test code")', 'Python')), html)
+
+
+class SnippetHighlightViewTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='Python')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='print("Test code")',
+            is_private=False,
+            author=self.user
+        )
+
+    def test_detail_page_has_highlighted_code(self):
+        response = self.client.get(reverse('snippet_detail_page', kwargs={'slug': self.snippet.slug}))
+        self.assertContains(response, '<span class="nb">print</span>', html=False)
+        self.assertNotContains(response, 'rainbow')
+
+    def test_update_invalidates_cached_code(self):
+        self.client.get(reverse('snippet_detail_page', kwargs={'slug': self.snippet.slug}))
+        old_key = highlight_cache_key('print("Test code")', 'Python')
+        self.assertIsNotNone(cache.get(old_key))
+
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        self.client.post(
+            f'/snippets/{self.snippet.slug}/update?next=/snippets/{self.snippet.slug}',
+            data={'name': 'TestName', 'lang': 'Python', 'code': 'len("Test code")', 'is_private': False}
+        )
+        self.assertIsNone(cache.get(old_key))
+        response = self.client.get(reverse('snippet_detail_page', kwargs={'slug': self.snippet.slug}))
+        self.assertContains(response, '<span class="nb">len</span>', html=False)
@@ -0,0 +1,106 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+
+from AJAX.models import SnippetLike
+from Comments.models import Comment
+from MainApp.leaderboards import refresh_if_due, refresh_leaderboards, top_entries
+from MainApp.models import LeaderboardEntry, Snippet, SupportedLang
+
+
+class LeaderboardsTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.users = [User.objects.create_user(f'TestUser{num}') for num in range(4)]
+        self.python = SupportedLang.objects.create(lang='Python')
+        self.go = SupportedLang.objects.create(lang='Go')
+        self.old = self.create_snippet('Old favourite', self.python)
+        self.new = self.create_snippet('New favourite', self.go)
+        self.private = self.create_snippet('Private', self.python, is_private=True)
+
+        for user in self.users:
+            SnippetLike.objects.create(snippet=self.old, author=user)
+        SnippetLike.objects.filter(snippet=self.old).update(date=timezone.now() - timedelta(days=3))
+        for user in self.users[:2]:
+            SnippetLike.objects.create(snippet=self.new, author=user)
+            SnippetLike.objects.create(snippet=self.private, author=user)
+        Comment.objects.create(snippet=self.new, author=self.users[0], text='Test text')
+
+    def create_snippet(self, name, lang, is_private=False):
+        return Snippet.objects.create(name=name, lang=lang, code='print("Test code")', is_private=is_private,
+                                      author=self.users[0])
+
+    def ranking(self, board, window, lang=''):
+        return [(entry['slug'], entry['score']) for entry in top_entries(board, window, lang)]
+
+    def test_windows(self):
+        refresh_leaderboards()
+        self.assertEqual(self.ranking('likes', 'day'), [(self.new.slug, 2)])
+        self.assertEqual(self.ranking('likes', 'week'), [(self.old.slug, 4), (self.new.slug, 2)])
+        self.assertEqual(self.ranking('likes', 'all'), [(self.old.slug, 4), (self.new.slug, 2)])
+        self.assertEqual(self.ranking('comments', 'day'), [(self.new.slug, 1)])
+
+    def test_languages(self):
+        refresh_leaderboards()
+        self.assertEqual(self.ranking('likes', 'week', 'Python'), [(self.old.slug, 4)])
+        self.assertEqual(self.ranking('likes', 'week', 'Go'), [(self.new.slug, 2)])
+
+    def test_refresh_replaces_entries(self):
+        refresh_leaderboards()
+        SnippetLike.objects.filter(snippet=self.new).delete()
+        refresh_leaderboards(windows=['day'])
+        self.assertEqual(self.ranking('likes', 'day'), [])
+        self.assertEqual(self.ranking('likes', 'week'), [(self.old.slug, 4), (self.new.slug, 2)])
+
+    def test_snippet_made_private_is_hidden(self):
+        refresh_leaderboards()
+        Snippet.objects.filter(pk=self.new.pk).update(is_private=True)
+        self.assertEqual(self.ranking('likes', 'week'), [(self.old.slug, 4)])
+
+    def test_top_is_one_query(self):
+        refresh_leaderboards()
+        with self.assertNumQueries(1):
+            self.ranking('likes', 'week')
+
+    def test_refresh_if_due(self):
+        self.assertTrue(refresh_if_due(60))
+        self.assertTrue(LeaderboardEntry.objects.exists())
+        # Also for the other workers, whose caches know nothing of the refresh
+        cache.clear()
+        self.assertFalse(refresh_if_due(60))
+        LeaderboardEntry.objects.update(refreshed_at=timezone.now() - timedelta(seconds=61))
+        self.assertTrue(refresh_if_due(60))
+
+    def test_refresh_skips_while_another_runs(self):
+        with mock.patch('MainApp.leaderboards._try_lock', return_value=False):
+            self.assertIsNone(refresh_leaderboards())
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command('refresh_leaderboards', board=['likes'], window=['all'], stdout=out)
+        # Both snippets in the leaderboard of all languages and one in each language
+        self.assertIn('4 leaderboard entries are stored', out.getvalue())
+
+    def test_index_page(self):
+        refresh_leaderboards()
+        response = self.client.get(reverse('home'))
+        (_, of_day), (_, of_week) = response.context['top_tens_of_period']
+        self.assertEqual([entry['slug'] for entry in of_day], [self.new.slug])
+        self.assertEqual([entry['slug'] for entry in of_week], [self.old.slug, self.new.slug])
+
+    def test_json(self):
+        refresh_leaderboards()
+        response = self.client.get(reverse('leaderboard_json', kwargs={'board': 'likes', 'window': 'week'}),
+                                   {'lang': 'Go', 'limit': 5})
+        self.assertEqual(response.json()['data'][0]['slug'], self.new.slug)
+        self.assertIn('public', response['Cache-Control'])
+        response = self.client.get(reverse('leaderboard_json', kwargs={'board': 'likes', 'window': 'year'}))
+        self.assertEqual(response.status_code, 404)
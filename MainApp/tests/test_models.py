@@ -1,7 +1,6 @@
 from django.test import TestCase
 from MainApp.models import SupportedLang, Snippet
 from django.contrib.auth.models import User
-import datetime as dt
 
 
 class SupportedLangTest(TestCase):
@@ -37,9 +36,17 @@ class SnippetModelTest(TestCase):
         self.assertEqual(max_length, 5000)
 
     def test_slug_field(self):
-        expected_date = (self.snippet.creation_date + dt.timedelta(hours=3)).strftime('%d-%m-%y-%H-%M-%S')
-        expected_slug = 'test-snippet-1_' + expected_date
-        self.assertEqual(self.snippet.slug, expected_slug)
+        self.assertRegex(self.snippet.slug, r'^test-snippet-1_[0-9a-z]{18}$')
+
+    def test_slug_of_same_name_is_unique(self):
+        snippet = Snippet.objects.create(
+            name=self.snippet.name,
+            lang=self.test_lang,
+            code='print("Test code")',
+            is_private=False,
+            author=self.test_user
+        )
+        self.assertNotEqual(snippet.slug, self.snippet.slug)
 
     def test_to_dict_json(self):
         json = self.snippet.to_dict_json()
@@ -0,0 +1,155 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from MainApp.models import Snippet, SnippetRevision, SupportedLang
+from MainApp.revisions import (SNAPSHOT_INTERVAL, apply_delta, get_revision, make_delta, prune_revisions,
+                               record_revision, revision_list)
+
+
+def code_version(num):
+    return '\n'.join(f'line_{line} = compute({line})' for line in range(60)) + f'\nresult = {num}\n'
+
+
+class DeltaTest(TestCase):
+    def test_delta_rebuilds_code(self):
+        base = 'a = 1\nb = 2\nc = 3\n'
+        for code in ('a = 1\nb = 20\nc = 3\n', '', 'c = 3\n', 'x\r\ny\r\n', base + 'd = 4'):
+            self.assertEqual(apply_delta(base, make_delta(base, code)), code)
+
+
+class RevisionTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='Python')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code=code_version(0),
+            is_private=False,
+            author=self.user
+        )
+
+    def edit(self, count):
+        for num in range(1, count + 1):
+            self.snippet.code = code_version(num)
+            self.snippet.save()
+            record_revision(self.snippet, self.user.id)
+
+    def test_revisions_are_deltas_between_snapshots(self):
+        record_revision(self.snippet, self.user.id)
+        self.edit(SNAPSHOT_INTERVAL + 2)
+        revisions = list(SnippetRevision.objects.order_by('number'))
+        self.assertEqual([revision.number for revision in revisions if revision.is_snapshot],
+                         [1, SNAPSHOT_INTERVAL + 1])
+        self.assertEqual(revisions[1].base_number, 1)
+        self.assertLess(len(revisions[1].data), len(revisions[0].data))
+
+    def test_any_revision_is_rebuilt_with_at_most_two_queries(self):
+        record_revision(self.snippet, self.user.id)
+        self.edit(SNAPSHOT_INTERVAL + 2)
+        for number in range(1, SNAPSHOT_INTERVAL + 4):
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(get_revision(self.snippet, number).code, code_version(number - 1))
+            self.assertLessEqual(len(captured), 2)
+
+    def test_first_edit_keeps_previous_code(self):
+        self.snippet.code = code_version(1)
+        self.snippet.save()
+        record_revision(self.snippet, self.user.id, previous=(code_version(0), 'Python'))
+        self.assertEqual(get_revision(self.snippet, 1).code, code_version(0))
+        self.assertEqual(get_revision(self.snippet, 2).code, code_version(1))
+
+    def test_revision_list_has_no_code(self):
+        record_revision(self.snippet, self.user.id)
+        self.edit(2)
+        with self.assertNumQueries(1):
+            revisions = list(revision_list(self.snippet))
+        self.assertEqual([revision['number'] for revision in revisions], [3, 2, 1])
+        self.assertEqual(revisions[0]['author_name'], 'TestUser')
+        self.assertNotIn('data', revisions[0])
+
+    def test_prune_keeps_newest_revisions_readable(self):
+        record_revision(self.snippet, self.user.id)
+        self.edit(SNAPSHOT_INTERVAL + 4)
+        self.assertEqual(prune_revisions(self.snippet.id, keep=5), SNAPSHOT_INTERVAL)
+        numbers = list(SnippetRevision.objects.order_by('number').values_list('number', flat=True))
+        self.assertEqual(numbers, list(range(SNAPSHOT_INTERVAL + 1, SNAPSHOT_INTERVAL + 6)))
+        for number in numbers:
+            self.assertEqual(get_revision(self.snippet, number).code, code_version(number - 1))
+
+    def test_prune_turns_orphaned_delta_into_snapshot(self):
+        record_revision(self.snippet, self.user.id)
+        self.edit(3)
+        prune_revisions(self.snippet.id, keep=2)
+        revisions = list(SnippetRevision.objects.order_by('number'))
+        self.assertTrue(revisions[0].is_snapshot)
+        self.assertEqual(revisions[1].base_number, revisions[0].number)
+        self.assertEqual(get_revision(self.snippet, 4).code, code_version(3))
+
+    def test_prune_command(self):
+        record_revision(self.snippet, self.user.id)
+        self.edit(5)
+        out = StringIO()
+        call_command('prune_snippet_revisions', keep=2, stdout=out)
+        self.assertIn('4 revisions of 1 snippets are dropped', out.getvalue())
+        call_command('prune_snippet_revisions', keep=2, older_than=1, stdout=out)
+        self.assertEqual(SnippetRevision.objects.count(), 2)
+
+
+class RevisionViewTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='Python')
+        self.client.login(username='TestUser', password='Pa55w.rd')
+
+    def test_update_records_revisions(self):
+        self.client.post(reverse('add_snippet_page'),
+                         data={'name': 'TestName', 'lang': 'Python', 'code': 'a = 1', 'is_private': True})
+        snippet = Snippet.objects.get()
+        # The code of a snippet which is never edited is not copied into the history
+        self.assertFalse(SnippetRevision.objects.exists())
+        self.client.post(f'/snippets/{snippet.slug}/update?next=/snippets/{snippet.slug}',
+                         data={'name': 'TestName', 'lang': 'Python', 'code': 'a = 2', 'is_private': True})
+        self.client.post(f'/snippets/{snippet.slug}/update?next=/snippets/{snippet.slug}',
+                         data={'name': 'Other name', 'lang': 'Python', 'code': 'a = 2', 'is_private': True})
+
+        response = self.client.get(reverse('snippet_revisions_json', kwargs={'slug': snippet.slug}))
+        self.assertEqual([revision['number'] for revision in response.json()['data']], [2, 1])
+        response = self.client.get(reverse('snippet_revision_json', kwargs={'slug': snippet.slug, 'number': 1}))
+        self.assertEqual(response.json()['code'], 'a = 1')
+        response = self.client.get(reverse('snippet_revision_json', kwargs={'slug': snippet.slug, 'number': 3}))
+        self.assertEqual(response.status_code, 404)
+
+        self.client.logout()
+        response = self.client.get(reverse('snippet_revisions_json', kwargs={'slug': snippet.slug}))
+        self.assertEqual(response.status_code, 403)
+
+
+@unittest.skipIf(connection.vendor != 'postgresql', 'The in-memory SQLite test database fails concurrent writers')
+class ConcurrentRevisionTest(TransactionTestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser')
+        self.lang = SupportedLang.objects.create(lang='Python')
+        self.snippet = Snippet.objects.create(name='Test Snippet', lang=self.lang, code=code_version(0),
+                                              is_private=False, author=self.user)
+
+    def test_concurrent_edits_get_their_own_numbers(self):
+        def edit(num):
+            try:
+                snippet = Snippet.objects.get(pk=self.snippet.pk)
+                snippet.code = code_version(num)
+                record_revision(snippet, self.user.id)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(edit, range(1, 25)))
+        self.assertEqual(sorted(self.snippet.revisions.values_list('number', flat=True)), list(range(1, 25)))
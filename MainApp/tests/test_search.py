@@ -0,0 +1,77 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+
+from MainApp.models import Snippet, SupportedLang
+from MainApp.search import query_terms, search_sql, tokenize
+
+
+class TokenizerTest(TestCase):
+    def test_identifiers_are_split(self):
+        tokens = list(tokenize('getHTTPResponse user_name'))
+        self.assertEqual(tokens, ['gethttpresponse', 'get', 'http', 'response', 'user_name', 'user', 'name'])
+
+    def test_query_terms_are_identifier_parts(self):
+        self.assertEqual(query_terms('getUser get_user'), ['get', 'user'])
+        self.assertEqual(query_terms('Привет'), ['привет'])
+
+
+class SnippetSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user('TestUser')
+        self.lang = SupportedLang.objects.create(lang='Python')
+        self.in_name = Snippet.objects.create(
+            name='Parse user name',
+            lang=self.lang,
+            code='pass',
+            is_private=False,
+            author=self.user
+        )
+        self.in_code = Snippet.objects.create(
+            name='Helpers',
+            lang=self.lang,
+            code='def get_user_name(request):\n    return request.user.username',
+            is_private=False,
+            author=self.user
+        )
+        self.unrelated = Snippet.objects.create(
+            name='Sorting',
+            lang=self.lang,
+            description='Quick sort',
+            code='def quickSort(items): ...',
+            is_private=False,
+            author=self.user
+        )
+
+    def search(self, query):
+        fragment = search_sql(query)
+        sql = f'''
+        SELECT s.name, {fragment.rank} AS rank
+        FROM "MainApp_snippet" AS s
+        WHERE {fragment.where}
+        ORDER BY rank DESC
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, fragment.rank_params + fragment.where_params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_results_are_ranked(self):
+        self.assertEqual(self.search('user name'), ['Parse user name', 'Helpers'])
+
+    def test_code_identifiers_are_searchable(self):
+        self.assertEqual(self.search('userName'), ['Parse user name', 'Helpers'])
+        self.assertEqual(self.search('quick_sort'), ['Sorting'])
+
+    def test_prefix_match(self):
+        self.assertEqual(self.search('Sort'), ['Sorting'])
+
+    def test_index_follows_updates(self):
+        self.unrelated.name = 'Bubble'
+        self.unrelated.description = ''
+        self.unrelated.code = 'pass'
+        self.unrelated.save()
+        self.assertEqual(self.search('sort'), [])
+        self.assertEqual(self.search('bubble'), ['Bubble'])
+
+    def test_empty_query(self):
+        self.assertIsNone(search_sql(' ,. '))
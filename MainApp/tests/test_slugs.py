@@ -0,0 +1,53 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth.models import User
+from django.db import connection
+
+from MainApp.models import Snippet, SupportedLang
+from MainApp.slugs import make_slug, next_id
+
+
+class SlugAllocatorTest(TestCase):
+    def test_ids_are_increasing(self):
+        ids = [next_id() for _ in range(1000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 1000)
+
+    def test_parallel_slugs_are_unique(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            slugs = list(executor.map(make_slug, ['Same name'] * 20000))
+        self.assertEqual(len(set(slugs)), 20000)
+
+    def test_slug_fits_the_field(self):
+        slug = make_slug('x' * 500)
+        self.assertLessEqual(len(slug), Snippet._meta.get_field('slug').max_length)
+        self.assertTrue(make_slug('Привет').startswith('snippet_'))
+
+    def test_bulk_created_same_names(self):
+        user = User.objects.create_user('TestUser')
+        lang = SupportedLang.objects.create(lang='TestLang')
+        Snippet.objects.bulk_create([
+            Snippet(name='Same name', slug=Snippet.make_slug('Same name'), lang=lang,
+                    code='pass', is_private=False, author=user)
+            for _ in range(2000)
+        ])
+        self.assertEqual(Snippet.objects.values('slug').distinct().count(), 2000)
+
+
+@unittest.skipIf(connection.vendor == 'sqlite', 'SQLite locks the whole database on concurrent writes')
+class ConcurrentSnippetCreationTest(TransactionTestCase):
+    def test_parallel_creation_of_same_names(self):
+        user = User.objects.create_user('TestUser')
+        lang = SupportedLang.objects.create(lang='TestLang')
+
+        def create(_):
+            try:
+                Snippet.objects.create(name='Same name', lang=lang, code='pass', is_private=False, author=user)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(create, range(2000)))
+        self.assertEqual(Snippet.objects.filter(name='Same name').count(), 2000)
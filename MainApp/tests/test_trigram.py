@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+
+from MainApp.models import Snippet, SupportedLang
+from MainApp.trigram import similarity, trigram_search_sql, trigrams
+
+
+class TrigramTest(TestCase):
+    def test_trigrams_are_padded_like_pg_trgm(self):
+        self.assertEqual(trigrams('Cat'), {'  c', ' ca', 'cat', 'at '})
+
+    def test_similarity(self):
+        self.assertEqual(similarity(trigrams('word'), trigrams('word')), 1.0)
+        self.assertEqual(similarity(trigrams('word'), trigrams('')), 0.0)
+
+
+class TrigramSearchTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user('Programmer')
+        self.lang = SupportedLang.objects.create(lang='Python')
+        for name in ('Binary search', 'Bubble sort', 'Database connection'):
+            Snippet.objects.create(name=name, lang=self.lang, code='pass', is_private=False, author=self.user)
+
+    def search(self, query, username=''):
+        fragment = trigram_search_sql(query, username=username)
+        sql = f'''
+        SELECT s.name, {fragment.rank} AS rank
+        FROM "MainApp_snippet" AS s
+        LEFT OUTER JOIN "auth_user" AS u ON s.author_id = u.id
+        WHERE {fragment.where}
+        ORDER BY rank DESC, s.name
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, fragment.rank_params + fragment.where_params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_contains_search(self):
+        self.assertEqual(self.search('earch'), ['Binary search'])
+
+    def test_typo_tolerance(self):
+        self.assertEqual(self.search('Buble srot'), ['Bubble sort'])
+
+    def test_author_search(self):
+        self.assertEqual(len(self.search('programer')), 3)
+
+    def test_index_follows_changes(self):
+        snippet = Snippet.objects.get(name='Bubble sort')
+        self.assertEqual(self.search('bubble'), ['Bubble sort'])
+        snippet.name = 'Merge sort'
+        snippet.save()
+        self.assertEqual(self.search('bubble'), [])
+        snippet.delete()
+        self.assertEqual(self.search('merge'), [])
+
+    @unittest.skipIf(connection.vendor == 'postgresql', 'The in-process index is not used on PostgreSQL')
+    def test_listing_filters_go_before_the_match_limit(self):
+        other_user = User.objects.create_user('Other')
+        for num in range(3):
+            Snippet.objects.create(name=f'Binary search {num}', lang=self.lang, code='pass', is_private=False,
+                                   author=other_user)
+        Snippet.objects.create(name='Binary search of mine', lang=self.lang, code='pass', is_private=True,
+                               author=self.user)
+        with mock.patch('MainApp.trigram.FALLBACK_MAX_MATCHES', 2):
+            self.assertEqual(self.search('binary search', username='Programmer'),
+                             ['Binary search', 'Binary search of mine'])
+            self.assertNotIn('Binary search of mine', self.search('binary search of mine'))
+
+    def test_no_matches(self):
+        self.assertEqual(self.search('zzzzzz'), [])
+        self.assertIsNone(trigram_search_sql('  '))
@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from AJAX.models import SnippetLike
 from Comments.models import Comment
@@ -312,3 +314,152 @@ class UserSnippetsListViewTest(TestCase):
         response = self.client.get(reverse('my_snippets_list_page'))
         self.assertEqual(response.status_code, 200)
         self.assertTrue('pagename' in response.context)
+
+
+class IndexPageCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user('TestUser')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='Test Snippet',
+            lang=self.lang,
+            code='print("Test code")',
+            is_private=False,
+            author=self.user
+        )
+
+    def test_cached_page_renders_without_queries(self):
+        self.client.get(reverse('home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_snippet_creation_invalidates_cache(self):
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['snippets_count'], 1)
+        Snippet.objects.create(
+            name='Test Snippet 2',
+            lang=self.lang,
+            code='print("Test code")',
+            is_private=False,
+            author=self.user
+        )
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['snippets_count'], 2)
+
+    def test_like_and_comment_invalidate_cache(self):
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['top_ten_by_rating'], [])
+        SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+        Comment.objects.create(snippet=self.snippet, author=self.user, text='Test text')
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['top_ten_by_rating'][0]['like_count'], 1)
+        self.assertEqual(response.context['top_ten_by_reviews'][0]['comment_count'], 1)
+
+    def test_privacy_change_invalidates_cache(self):
+        SnippetLike.objects.create(snippet=self.snippet, author=self.user)
+        response = self.client.get(reverse('home'))
+        self.assertEqual(len(response.context['top_ten_by_rating']), 1)
+        self.snippet.refresh_from_db()
+        self.snippet.is_private = True
+        self.snippet.save()
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['top_ten_by_rating'], [])
+
+
+class SnippetDetailViewQueriesTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+        commenters = [User.objects.create_user(username=f'Commenter{num}') for num in range(10)]
+        Comment.objects.bulk_create([
+            Comment(snippet=self.snippet, author=commenters[num % 10], text=f'Comment {num}')
+            for num in range(300)
+        ])
+        self.url = reverse('snippet_detail_page', kwargs={'slug': self.snippet.slug})
+
+    def test_anon_user_query_count(self):
+        # snippet with its author, comments with their authors
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_logged_in_query_count(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        # session, user, snippet with its author, like state, comments with their authors
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_comments_are_ordered_by_date(self):
+        response = self.client.get(self.url)
+        comments = list(response.context['comments'])
+        self.assertEqual(len(comments), 20)
+        self.assertEqual(comments[0].text, 'Comment 299')
+        self.assertIsNotNone(response.context['comments_next_cursor'])
+
+    def test_private_snippet_of_other_user(self):
+        self.snippet.is_private = True
+        self.snippet.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+class SnippetDetailConditionalGetTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='print("Test code")',
+            is_private=False,
+            author=self.user
+        )
+        self.url = reverse('snippet_detail_page', kwargs={'slug': self.snippet.slug})
+
+    def test_unchanged_snippet_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_comment_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        Comment.objects.create(snippet=self.snippet, author=self.user, text='TestText')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_user(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_csrf_token(self):
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # As after logging in again, which rotates the token
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = 'x' * 32
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_cache_control(self):
+        self.assertIn('public', self.client.get(self.url)['Cache-Control'])
+        self.snippet.is_private = True
+        self.snippet.save()
+        self.client.login(username='TestUser', password='Pa55w.rd')
+        response = self.client.get(self.url)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
@@ -0,0 +1,183 @@
+"""
+Substring and typo-tolerant search on snippet names and author names. PostgreSQL
+uses pg_trgm GIN indexes, other databases an in-process trigram index.
+"""
+import re
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import Snippet
+from .search import SearchSQL
+
+WORD_RE = re.compile(r'[^\W_]+')
+INDEX_VERSION_CACHE_KEY = 'MainApp:trigram_index_version'
+# Upper bound of the matches the in-process index passes to the database
+FALLBACK_MAX_MATCHES = 500
+
+
+def trigrams(text):
+    """Same trigrams as pg_trgm makes: every word is padded with two spaces in front and one at the end"""
+    result = set()
+    for word in WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(left, right):
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class TrigramIndex:
+    """Inverted trigram index of (name, author name) of all snippets kept in the process memory,
+    with what the listings filter them by, so the best matches are taken from the listed snippets"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.documents = {}
+        self.postings = {}
+
+    def _add(self, snippet_id, name, username, is_private, lang):
+        grams = (trigrams(name), trigrams(username))
+        self.documents[snippet_id] = (name.lower(), username.lower(), grams, (username, is_private, lang))
+        for gram in grams[0] | grams[1]:
+            self.postings.setdefault(gram, set()).add(snippet_id)
+
+    def _remove(self, snippet_id):
+        document = self.documents.pop(snippet_id, None)
+        if document:
+            for gram in document[2][0] | document[2][1]:
+                self.postings[gram].discard(snippet_id)
+
+    def _ensure_fresh(self):
+        version = cache.get(INDEX_VERSION_CACHE_KEY)
+        if version is None or version != self.version:
+            self.documents, self.postings = {}, {}
+            fields = ('pk', 'name', 'author__username', 'is_private', 'lang_id')
+            for snippet_id, name, username, is_private, lang in Snippet.objects.values_list(*fields):
+                self._add(snippet_id, name, username, is_private, lang)
+            if version is None:
+                version = uuid.uuid4().hex
+                cache.set(INDEX_VERSION_CACHE_KEY, version, None)
+            self.version = version
+
+    def update(self, snippet_id, snippet=None):
+        """Replaces (or removes, when snippet is None) one snippet and tells other processes to rebuild"""
+        with self.lock:
+            if self.version is not None:
+                self._remove(snippet_id)
+                if snippet is not None:
+                    self._add(snippet_id, snippet.name, snippet.author.username, snippet.is_private,
+                              snippet.lang_id)
+                self.version = uuid.uuid4().hex
+            cache.set(INDEX_VERSION_CACHE_KEY, self.version or uuid.uuid4().hex, None)
+
+    def reset(self):
+        """Makes every process rebuild its index, e.g. after a bulk import"""
+        with self.lock:
+            self.version = None
+            cache.delete(INDEX_VERSION_CACHE_KEY)
+
+    def search(self, query, threshold, username='', lang=None):
+        """Returns {snippet id: score} of the best matches among the snippets of the user
+        (the public ones without a username), in the language if one is given"""
+        query = query.lower()
+        query_grams = trigrams(query)
+        with self.lock:
+            self._ensure_fresh()
+            candidates = set()
+            for gram in query_grams:
+                candidates |= self.postings.get(gram, set())
+            scores = {}
+            for snippet_id in candidates:
+                name, author_name, grams, (author, is_private, snippet_lang) = self.documents[snippet_id]
+                listed = author == username if username else not is_private
+                if not listed or lang and snippet_lang != lang:
+                    continue
+                score = max(similarity(query_grams, grams[0]), similarity(query_grams, grams[1]))
+                if score >= threshold or query in name or query in author_name:
+                    scores[snippet_id] = score
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return dict(best[:FALLBACK_MAX_MATCHES])
+
+
+fallback_index = TrigramIndex()
+
+
+class PostgresTrigramBackend:
+    def set_threshold(self):
+        # The similarity threshold of the % operator is a setting of the session,
+        # connection.connection is None until the first query opens it
+        connection.ensure_connection()
+        if getattr(connection, 'trigram_threshold_of', None) is not connection.connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, false)",
+                               [str(settings.TRIGRAM_SIMILARITY_THRESHOLD)])
+            connection.trigram_threshold_of = connection.connection
+
+    def search_sql(self, query, alias, user_alias, username='', lang=None):
+        # The listing filters by username and language itself
+        self.set_threshold()
+        contains = f'%{escape_like(query)}%'
+        return SearchSQL(
+            where=f'''({alias}."name" ILIKE %s OR {user_alias}.username ILIKE %s
+                       OR {alias}."name" %% %s OR {user_alias}.username %% %s)''',
+            where_params=[contains, contains, query, query],
+            rank=f'GREATEST(similarity({alias}."name", %s), similarity({user_alias}.username, %s))',
+            rank_params=[query, query],
+        )
+
+
+class FallbackTrigramBackend:
+    def search_sql(self, query, alias, user_alias, username='', lang=None):
+        # The filters of the listing go before the FALLBACK_MAX_MATCHES limit, so it is not spent on other snippets
+        scores = fallback_index.search(query, settings.TRIGRAM_SIMILARITY_THRESHOLD, username, lang)
+        if not scores:
+            return SearchSQL(where='1 = 0', where_params=[], rank='0', rank_params=[])
+        placeholders = ', '.join(['%s'] * len(scores))
+        return SearchSQL(
+            where=f'{alias}.id IN ({placeholders})',
+            where_params=list(scores),
+            rank=f'CASE {alias}.id {" ".join(["WHEN %s THEN %s"] * len(scores))} ELSE 0 END',
+            rank_params=[value for item in scores.items() for value in item],
+        )
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresTrigramBackend()
+    return FallbackTrigramBackend()
+
+
+def trigram_search_sql(query, alias='s', user_alias='u', username='', lang=None):
+    """Returns SQL fragments matching and ranking the snippets aliased as `alias`
+    (with their author aliased as `user_alias`), or None for an empty query. `username`
+    and `lang` are the filters of the listing (no username for the public snippets)."""
+    query = (query or '').strip()
+    if not query:
+        return None
+    return get_backend().search_sql(query, alias, user_alias, username, lang)
+
+
+def update_fallback_index(snippet, deleted=False):
+    if connection.vendor != 'postgresql':
+        if deleted:
+            fallback_index.update(snippet.pk)
+        else:
+            fallback_index.update(snippet.pk, snippet)
+
+
+def reset_fallback_index():
+    if connection.vendor != 'postgresql':
+        fallback_index.reset()
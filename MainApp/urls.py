@@ -1,5 +1,7 @@
 from django.urls import path
+from django.views.decorators.http import condition
 from MainApp import views
+from MainApp.conditional import snippet_cache_control, snippet_etag, snippet_last_modified
 from django.contrib.auth.decorators import login_required
 
 
@@ -7,8 +9,14 @@ urlpatterns = [
     path('', views.snippets_list, name='snippets_list_page'),
     path('my_list', views.user_snippets_list, name='my_snippets_list_page'),
     path('add', login_required(views.SnippetCreateView.as_view()), name='add_snippet_page'),
-    path('<slug:slug>', views.SnippetDetailView.as_view(), name='snippet_detail_page'),
+    path('<slug:slug>',
+         snippet_cache_control(condition(etag_func=snippet_etag, last_modified_func=snippet_last_modified)(
+             views.SnippetDetailView.as_view()
+         )),
+         name='snippet_detail_page'),
     path('<slug:slug>/update', login_required(views.SnippetUpdateView.as_view()), name='snippet_update_page'),
     path('<slug:slug>/delete', login_required(views.SnippetDeleteView.as_view()), name='snippet_delete_page'),
     path('<slug:slug>/toast_delete', views.snippet_delete, name='snippet_delete'),
+    path('<slug:slug>/revisions', views.snippet_revisions_json, name='snippet_revisions_json'),
+    path('<slug:slug>/revisions/<int:number>', views.snippet_revision_json, name='snippet_revision_json'),
 ]
\ No newline at end of file
@@ -1,40 +1,60 @@
+from django.conf import settings
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
-from django.shortcuts import render, redirect
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render, redirect
 from django.urls import reverse_lazy, reverse
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import UpdateView, DeleteView, CreateView
-from django.db.models import Count
+from django.core.cache import cache
+from django.db.models import F
 
+from .cache import INDEX_PAGE_CACHE_KEY
 from .forms import SnippetForm
-from .models import Snippet
+from .highlight import highlighted_code, invalidate_highlighted_code
+from .langs import supported_langs
+from .leaderboards import top_entries
+from .models import Snippet, SnippetRevision
+from .revisions import get_revision, record_revision, revision_list
 from Comments.forms import CommentForm
+from Comments.pagination import comment_page
 from AJAX.models import SnippetLike
 
 
 def index_page(request):
     context = {
         'pagename': '',
-        'snippets_count': Snippet.objects.all().count(),
-        'top_ten_by_rating': top_ten_by_rating(),
-        'top_ten_by_reviews': top_ten_by_reviews()
+        **cache.get_or_set(INDEX_PAGE_CACHE_KEY, index_page_data, settings.INDEX_PAGE_CACHE_TIMEOUT)
     }
     return render(request, 'pages/index.html', context)
 
 
+def index_page_data():
+    return {
+        'snippets_count': Snippet.objects.all().count(),
+        'top_ten_by_rating': list(top_ten_by_rating()),
+        'top_ten_by_reviews': list(top_ten_by_reviews()),
+        'top_tens_of_period': [
+            ('Топ-10 за день', list(top_entries('likes', 'day'))),
+            ('Топ-10 за неделю', list(top_entries('likes', 'week'))),
+        ],
+    }
+
+
+def top_snippets_rows(queryset):
+    return queryset.values('name', 'slug', 'lang_id', 'like_count', 'comment_count',
+                           author_name=F('author__username'))
+
+
 def top_ten_by_rating():
-    return Snippet.objects.filter(is_private=False) \
-               .annotate(likes=Count('snippetlike')) \
-               .filter(likes__gt=0) \
-               .order_by('-likes')[:10]
+    return top_snippets_rows(Snippet.objects.filter(is_private=False, like_count__gt=0)
+                                            .order_by('-like_count'))[:10]
 
 
 def top_ten_by_reviews():
-    return Snippet.objects.filter(is_private=False) \
-               .annotate(comments=Count('comment')) \
-               .filter(comments__gt=0) \
-               .order_by('-comments')[:10]
+    return top_snippets_rows(Snippet.objects.filter(is_private=False, comment_count__gt=0)
+                                            .order_by('-comment_count'))[:10]
 
 
 class SnippetCreateView(SuccessMessageMixin, CreateView):
@@ -58,6 +78,18 @@ class SnippetUpdateView(SuccessMessageMixin, UpdateView):
     template_name = 'pages/snippet_update.html'
     success_message = "Сниппет обновлен"
 
+    def get_object(self, queryset=None):
+        _object = super().get_object(queryset)
+        self.original_code = (_object.code, _object.lang_id)
+        return _object
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        if self.original_code != (self.object.code, self.object.lang_id):
+            invalidate_highlighted_code(*self.original_code)
+            record_revision(self.object, self.request.user.id, previous=self.original_code)
+        return response
+
     def get_success_url(self):
         return self.request.GET.get('next')
 
@@ -71,6 +103,7 @@ class SnippetDeleteView(SuccessMessageMixin, DeleteView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['pagename'] = 'Удаление сниппета'
+        context['highlighted_code'] = highlighted_code(self.object.code, self.object.lang_id)
         context['back_page'] = self.request.META.get('HTTP_REFERER', '/')
         return context
 
@@ -82,22 +115,25 @@ def snippet_delete(request, slug):
 
 
 class SnippetDetailView(DetailView):
-    model = Snippet
+    queryset = Snippet.objects.select_related('author', 'code_blob')
     template_name = 'pages/snippet_detail.html'
     context_object_name = 'snippet'
 
-    def dispatch(self, request, *args, **kwargs):
-        _object = self.get_object()
-        _user = self.request.user
-        if _object.is_private is True and _object.author != _user:
+    def get_object(self, queryset=None):
+        # Loaded by the conditional GET check (MainApp.conditional) already
+        _object = getattr(self.request, 'snippet', None) or super().get_object(queryset)
+        if _object.is_private is True and _object.author_id != self.request.user.id:
             raise PermissionDenied
-        return super().dispatch(request, *args, **kwargs)
+        return _object
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['pagename'] = 'Просмотр сниппета'
+        context['highlighted_code'] = highlighted_code(self.object.code, self.object.lang_id)
         context['user'] = self.request.user
         context['comment_form'] = CommentForm
+        if not self.object.is_private:
+            context['comments'], context['comments_next_cursor'] = comment_page(self.object)
         if self.request.user.id is not None:
             context['is_liked'] = SnippetLike.objects.filter(snippet=self.object, author=self.request.user).exists()
             context['anon_user'] = False
@@ -107,10 +143,37 @@ class SnippetDetailView(DetailView):
 
 
 def snippets_list(request):
-    context = {'pagename': 'База сниппетов'}
+    context = {'pagename': 'База сниппетов', 'langs': supported_langs()}
     return render(request, 'pages/snippet_list.html', context)
 
 
 def user_snippets_list(request):
-    context = {'pagename': 'Мои сниппеты'}
+    context = {'pagename': 'Мои сниппеты', 'langs': supported_langs()}
     return render(request, 'pages/my_snippet_list.html', context)
+
+
+def readable_snippet(request, slug):
+    snippet = get_object_or_404(Snippet, slug=slug)
+    if snippet.is_private and snippet.author_id != request.user.id:
+        raise PermissionDenied
+    return snippet
+
+
+def snippet_revisions_json(request, slug):
+    snippet = readable_snippet(request, slug)
+    return JsonResponse({'data': list(revision_list(snippet))})
+
+
+def snippet_revision_json(request, slug, number):
+    snippet = readable_snippet(request, slug)
+    try:
+        revision = get_revision(snippet, number)
+    except SnippetRevision.DoesNotExist:
+        return JsonResponse({'error': f'No revision {number}'}, status=404)
+    return JsonResponse({
+        'number': revision.number,
+        'created_at': revision.created_at,
+        'lang': revision.lang,
+        'author': revision.author.username if revision.author else None,
+        'code': revision.code,
+    })
@@ -12,5 +12,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pet_Snippets.settings')
+# Every request runs in a thread of its own, whose persistent connection would never be reused
+os.environ.setdefault('DJANGO_DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
+
+from MainApp.leaderboards import start_scheduler  # noqa: E402 (needs the apps loaded)
+
+start_scheduler()
@@ -0,0 +1,96 @@
+"""
+Helpers of the async views. Database work of the async views goes through
+run_db(), which bounds how many of it run at once per event loop, so a burst of
+requests waits for a free slot instead of opening a connection per request.
+"""
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.contrib.auth import REDIRECT_FIELD_NAME
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed
+
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def db_semaphore():
+    """Semaphore of the running event loop, asyncio primitives can't be shared between loops"""
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(settings.ASYNC_DB_CONCURRENCY)
+    return _semaphores[loop]
+
+
+async def run_db(func, *args, **kwargs):
+    """Runs synchronous database code in the thread of the request"""
+    async with db_semaphore():
+        return await sync_to_async(func)(*args, **kwargs)
+
+
+def _load_user(request):
+    # Evaluates the lazy request.user, which queries the session and the user
+    request.user.is_authenticated
+    return request.user
+
+
+async def get_user(request):
+    async with db_semaphore():
+        return await sync_to_async(_load_user)(request)
+
+
+def async_login_required(view=None, redirect_field_name=REDIRECT_FIELD_NAME):
+    """login_required for async views (the one of Django 4.1 only wraps sync views)"""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            user = await get_user(request)
+            if not user.is_authenticated:
+                return redirect_to_login(request.get_full_path(), redirect_field_name=redirect_field_name)
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator(view) if view else decorator
+
+
+def async_require_POST(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def _close_stream(iterator):
+    if hasattr(iterator, 'close'):
+        iterator.close()
+    connections.close_all()
+
+
+def stream_in_thread(iterator):
+    """Yields the items of an iterator which reads the database, for a StreamingHttpResponse.
+
+    Django 4.1 iterates streaming content inside the event loop under ASGI, where the
+    ORM refuses to run, so there every item is read in a thread of the stream's own
+    (with its own connection, closed at the end). The loop waits for each item.
+    Under WSGI the iterator is used as it is.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        yield from iterator
+        return
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='stream') as executor:
+        try:
+            while True:
+                try:
+                    item = executor.submit(next, iterator).result()
+                except StopIteration:
+                    return
+                yield item
+        finally:
+            executor.submit(_close_stream, iterator).result()
@@ -0,0 +1,140 @@
+"""
+Per-request instrumentation: the view name, total time, number and total time of
+SQL queries, the slowest statements and repeated query fingerprints (N+1
+patterns) of a sampled share of the requests go to the structured log and,
+optionally, to the Server-Timing response header.
+"""
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('pet_Snippets.instrumentation')
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE)
+SPACE_RE = re.compile(r'\s+')
+MAX_SQL_LENGTH = 300
+
+
+def fingerprint(sql):
+    """Returns the statement with the literals and IN lists collapsed, so repeats of one query look the same"""
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return SPACE_RE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """execute_wrapper which counts and times the queries of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            self.statements.append((duration, sql))
+
+    def slowest(self, limit):
+        return [
+            {'sql': SPACE_RE.sub(' ', sql)[:MAX_SQL_LENGTH], 'ms': round(duration * 1000, 3)}
+            for duration, sql in sorted(self.statements, key=lambda statement: statement[0], reverse=True)[:limit]
+        ]
+
+    def duplicates(self):
+        counts = Counter(fingerprint(sql) for _, sql in self.statements)
+        return [
+            {'fingerprint': sql[:MAX_SQL_LENGTH], 'count': count}
+            for sql, count in counts.most_common() if count > 1
+        ]
+
+
+def _record_queries(recorder):
+    """Installs the recorder on the connections of the current thread, closing the returned stack removes it"""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(recorder))
+    return stack
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.INSTRUMENTATION_SAMPLE_RATE
+        self.server_timing = settings.INSTRUMENTATION_SERVER_TIMING
+        self.slow_queries = settings.INSTRUMENTATION_SLOW_QUERIES
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Under ASGI the chain stays async, as with django.utils.deprecation.MiddlewareMixin
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def _sampled(self):
+        return self.sample_rate and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with _record_queries(recorder):
+            response = self.get_response(request)
+        return self.report(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        # Connections belong to threads: the recorder goes to the ones of the thread
+        # in which the sync code of this request runs (see django.core.handlers.asgi)
+        stack = await sync_to_async(_record_queries)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, recorder, time.perf_counter() - started)
+
+    def report(self, request, response, recorder, total):
+        match = request.resolver_match
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 3),
+            'queries': recorder.count,
+            'sql_ms': round(recorder.duration * 1000, 3),
+            'slowest': recorder.slowest(self.slow_queries),
+            'duplicates': recorder.duplicates(),
+        }
+        logger.info(json.dumps(record), extra={'instrumentation': record})
+
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'total;dur={record["total_ms"]}, '
+                f'db;dur={record["sql_ms"]};desc="{recorder.count} queries"'
+            )
+        return response
@@ -0,0 +1,189 @@
+"""
+Token-bucket rate limiting of the write endpoints. A scope ("like", "comment")
+gets its rate from settings.RATE_LIMITS as "<requests>/<period>", e.g. "30/m"
+or "5/10s": a client may send that many requests at once and gets one more
+every period / requests seconds. Clients are users, or IP addresses before
+login. The buckets live in this process (memory backend) or in the Django
+cache, shared by the workers (cache backend, read-modify-write without a lock,
+so concurrent requests of one client may slip through a little).
+"""
+import asyncio
+import functools
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.functional import empty
+
+from pet_Snippets.async_views import get_user
+
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+@functools.lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Returns (capacity, tokens per second) of a "<requests>/<period>" rate"""
+    match = RATE_RE.match(rate)
+    if match is None:
+        raise ValueError(f'Bad rate "{rate}", expected e.g. "30/m" or "5/10s"')
+    requests, multiplier, unit = match.groups()
+    return int(requests), int(requests) / (int(multiplier or 1) * PERIODS[unit])
+
+
+def take_token(state, capacity, refill, now):
+    """Returns (new state, allowed, seconds until the next token) of a bucket in `state` (None for a full one)"""
+    tokens, updated = state or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * refill)
+    if tokens >= 1:
+        return (tokens - 1, now), True, 0
+    return (tokens, now), False, (1 - tokens) / refill
+
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill):
+        with self.lock:
+            state, allowed, retry_after = take_token(self.buckets.get(key), capacity, refill, time.monotonic())
+            self.buckets[key] = state
+            self.buckets.move_to_end(key)
+            # The least recently seen clients are forgotten, i.e. get a full bucket
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def reset(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBackend:
+    blocking = True
+
+    def consume(self, key, capacity, refill):
+        key = f'ratelimit:{key}'
+        state, allowed, retry_after = take_token(cache.get(key), capacity, refill, time.time())
+        # A bucket left alone for this long is full again, like a missing one
+        cache.set(key, state, math.ceil(capacity / refill))
+        return allowed, retry_after
+
+    def reset(self):
+        pass
+
+
+BACKENDS = {
+    'memory': MemoryBackend(),
+    'cache': CacheBackend(),
+}
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def _count(scope, outcome):
+    with _metrics_lock:
+        _metrics[scope, outcome] += 1
+
+
+def metrics():
+    """{scope: {"allowed": n, "limited": n}} of this process"""
+    with _metrics_lock:
+        result = {}
+        for (scope, outcome), count in _metrics.items():
+            result.setdefault(scope, {'allowed': 0, 'limited': 0})[outcome] = count
+        return result
+
+
+def reset():
+    """Empties the metrics and the in-process buckets, the tests posting likes or comments start with it"""
+    with _metrics_lock:
+        _metrics.clear()
+    for backend in BACKENDS.values():
+        backend.reset()
+
+
+def client_key(request, user):
+    if user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+def _limit(scope):
+    """Returns the (capacity, refill) of the scope, None if it is not limited"""
+    rate = settings.RATE_LIMITS.get(scope) if settings.RATE_LIMIT_ENABLED else None
+    return parse_rate(rate) if rate else None
+
+
+def _response(scope, allowed, retry_after):
+    _count(scope, 'allowed' if allowed else 'limited')
+    if allowed:
+        return None
+    response = JsonResponse({'error': 'Too many requests'}, status=429)
+    response['Retry-After'] = str(math.ceil(retry_after))
+    return response
+
+
+def check(request, scope):
+    """Takes a token of the client from the scope's bucket, returns the 429 response if there is none"""
+    limit = _limit(scope)
+    if limit is None:
+        return None
+    backend = BACKENDS[settings.RATE_LIMIT_BACKEND]
+    return _response(scope, *backend.consume(f'{scope}:{client_key(request, request.user)}', *limit))
+
+
+async def acheck(request, scope):
+    limit = _limit(scope)
+    if limit is None:
+        return None
+    user = request.user
+    if getattr(user, '_wrapped', None) is empty:
+        # Not loaded by a login check before
+        user = await get_user(request)
+    backend = BACKENDS[settings.RATE_LIMIT_BACKEND]
+    key = f'{scope}:{client_key(request, user)}'
+    if backend.blocking:
+        result = await sync_to_async(backend.consume)(key, *limit)
+    else:
+        result = backend.consume(key, *limit)
+    return _response(scope, *result)
+
+
+def rate_limit(scope):
+    """Answers 429 to the requests over the rate of the scope, for sync and async views"""
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                response = await acheck(request, scope)
+                if response is not None:
+                    return response
+                return await view(request, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = check(request, scope)
+            if response is not None:
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@staff_member_required
+def metrics_view(request):
+    return JsonResponse({'backend': settings.RATE_LIMIT_BACKEND, 'scopes': metrics()})
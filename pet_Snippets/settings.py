@@ -60,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'pet_Snippets.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -107,9 +108,107 @@ DATABASES = {
         'PASSWORD': 'gfhjkmlkz,fps',
         'HOST': 'localhost',
         'PORT': '',
+        # Seconds a connection is kept open between requests, 0 closes it after every request.
+        # Persistent connections are per thread, and Django 4.1 under ASGI runs every request
+        # in a new thread, so they would pile up (ticket #33497): asgi.py makes 0 the default.
+        'CONN_MAX_AGE': int(os.getenv('DJANGO_DB_CONN_MAX_AGE', 60)),
+        # Check a persistent connection before reusing it in a new request
+        'CONN_HEALTH_CHECKS': os.getenv('DJANGO_DB_CONN_HEALTH_CHECKS', '1') != '0',
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+if os.getenv('DJANGO_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('DJANGO_REDIS_URL'),
+        }
+    }
+elif os.getenv('DJANGO_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('DJANGO_CACHE_DIR'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Upper bound (in seconds) of how stale the cached index page aggregates can be
+INDEX_PAGE_CACHE_TIMEOUT = int(os.getenv('DJANGO_INDEX_PAGE_CACHE_TIMEOUT', 60))
+
+# Upper bound (in seconds) of how long a worker keeps a stale list of the supported languages
+SUPPORTED_LANGS_CACHE_TIMEOUT = int(os.getenv('DJANGO_SUPPORTED_LANGS_CACHE_TIMEOUT', 60))
+
+# Highlighted code is keyed by its content, so it can live long
+HIGHLIGHT_CACHE_TIMEOUT = int(os.getenv('DJANGO_HIGHLIGHT_CACHE_TIMEOUT', 60 * 60 * 24 * 7))
+
+# max-age of the public snippet pages and lists, they are revalidated with ETags afterwards
+HTTP_CACHE_MAX_AGE = int(os.getenv('DJANGO_HTTP_CACHE_MAX_AGE', 0))
+
+# Minimal pg_trgm similarity of a snippet name or author name to a fuzzy search query
+TRIGRAM_SIMILARITY_THRESHOLD = float(os.getenv('DJANGO_TRIGRAM_SIMILARITY_THRESHOLD', 0.3))
+
+
+# Request instrumentation (pet_Snippets.instrumentation)
+
+# Share of the requests whose timings and queries are recorded, 0 turns it off
+INSTRUMENTATION_SAMPLE_RATE = float(os.getenv('DJANGO_INSTRUMENTATION_SAMPLE_RATE', 0))
+INSTRUMENTATION_SERVER_TIMING = bool(os.getenv('DJANGO_INSTRUMENTATION_SERVER_TIMING'))
+INSTRUMENTATION_SLOW_QUERIES = int(os.getenv('DJANGO_INSTRUMENTATION_SLOW_QUERIES', 3))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'pet_Snippets.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# The snippet lists run as prepared statements on PostgreSQL. Turn it off behind
+# a connection pooler which does not keep the server session (e.g. PgBouncer in transaction mode).
+# Only persistent connections (CONN_MAX_AGE != 0) prepare them: a statement prepared on a connection
+# closed at the end of the request is never run again, so under ASGI they are run as they are.
+SNIPPETS_PREPARED_STATEMENTS = os.getenv('DJANGO_SNIPPETS_PREPARED_STATEMENTS', '1') != '0'
+
+# Seconds between the leaderboard refreshes of the in-process scheduler (MainApp.leaderboards),
+# 0 leaves them to the refresh_leaderboards command
+LEADERBOARD_REFRESH_INTERVAL = int(os.getenv('DJANGO_LEADERBOARD_REFRESH_INTERVAL', 0))
+
+# Code of the saved snippets goes to compressed content-addressed blobs (MainApp.models.CodeBlob),
+# the store_snippet_code command moves the existing snippets in and out
+SNIPPETS_CODE_BLOBS = os.getenv('DJANGO_SNIPPETS_CODE_BLOBS', '0') != '0'
+
+# Token-bucket limits of the write endpoints (pet_Snippets.ratelimit), "<requests>/<period>"
+# with the period in s, m, h or d (e.g. "5/10s"); an empty rate turns a scope off
+RATE_LIMIT_ENABLED = os.getenv('DJANGO_RATE_LIMIT_ENABLED', '1') != '0'
+# "memory" keeps the buckets in every worker, "cache" shares them through the cache
+RATE_LIMIT_BACKEND = os.getenv('DJANGO_RATE_LIMIT_BACKEND', 'memory')
+RATE_LIMITS = {
+    'like': os.getenv('DJANGO_RATE_LIMIT_LIKE', '30/m'),
+    'comment': os.getenv('DJANGO_RATE_LIMIT_COMMENT', '10/m'),
+}
+
+# How many requests of one ASGI worker can run database work of the async views at once,
+# every one of them holds a database connection meanwhile
+ASYNC_DB_CONCURRENCY = int(os.getenv('DJANGO_ASYNC_DB_CONCURRENCY', 10))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
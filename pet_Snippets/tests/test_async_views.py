@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from django.contrib.auth.models import User
+from django.core.exceptions import SynchronousOnlyOperation
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from pet_Snippets.async_views import db_semaphore, stream_in_thread
+
+
+class DbSemaphoreTest(SimpleTestCase):
+    @override_settings(ASYNC_DB_CONCURRENCY=2)
+    def test_concurrency_is_bounded(self):
+        running, peak = 0, 0
+
+        async def query():
+            nonlocal running, peak
+            async with db_semaphore():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        async def burst():
+            await asyncio.gather(*(query() for _ in range(10)))
+
+        asyncio.run(burst())
+        self.assertEqual(peak, 2)
+
+    def test_every_event_loop_has_its_own_semaphore(self):
+        async def semaphore():
+            return db_semaphore()
+
+        self.assertIsNot(asyncio.run(semaphore()), asyncio.run(semaphore()))
+
+
+class StreamInThreadTest(TransactionTestCase):
+    def setUp(self) -> None:
+        User.objects.bulk_create([User(username=f'TestUser{num}') for num in range(5)])
+
+    def usernames(self):
+        for user in User.objects.order_by('username').iterator(chunk_size=2):
+            yield user.username, threading.current_thread()
+
+    def stream_in_event_loop(self, iterator):
+        # As the ASGI handler of Django 4.1 sends a streaming response
+        async def send():
+            return [item for item in iterator]
+        return asyncio.run(send())
+
+    def test_database_is_read_in_a_thread_in_event_loop(self):
+        with self.assertRaises(SynchronousOnlyOperation):
+            self.stream_in_event_loop(self.usernames())
+        items = self.stream_in_event_loop(stream_in_thread(self.usernames()))
+        self.assertEqual([username for username, _ in items], [f'TestUser{num}' for num in range(5)])
+        self.assertNotIn(threading.current_thread(), {thread for _, thread in items})
+
+    def test_iterator_is_used_as_is_without_event_loop(self):
+        items = list(stream_in_thread(self.usernames()))
+        self.assertEqual({thread for _, thread in items}, {threading.current_thread()})
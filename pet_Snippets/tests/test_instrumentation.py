@@ -0,0 +1,87 @@
+import json
+
+from asgiref.sync import SyncToAsync
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path, reverse
+
+from Comments.models import Comment
+from MainApp.models import Snippet, SupportedLang
+from pet_Snippets.instrumentation import fingerprint
+
+
+def n_plus_one_view(request):
+    # Every comment is loaded with its own author query
+    return HttpResponse(', '.join(comment.author.username for comment in Comment.objects.all()))
+
+
+urlpatterns = [
+    path('n-plus-one', n_plus_one_view),
+]
+
+
+class FingerprintTest(TestCase):
+    def test_literals_are_collapsed(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 15 AND name = 'it''s'"),
+            fingerprint("SELECT * FROM t WHERE id = 7 AND name = 'other'"),
+        )
+
+    def test_in_lists_are_collapsed(self):
+        self.assertEqual(fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+                         'SELECT * FROM t WHERE id IN (...)')
+
+
+@override_settings(INSTRUMENTATION_SAMPLE_RATE=1.0, INSTRUMENTATION_SERVER_TIMING=True)
+class InstrumentationMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+
+    def get_record(self, url):
+        with self.assertLogs('pet_Snippets.instrumentation', 'INFO') as logs:
+            response = self.client.get(url)
+        return response, json.loads(logs.records[-1].getMessage())
+
+    def test_request_is_recorded(self):
+        response, record = self.get_record(reverse('snippet_detail_page', kwargs={'slug': self.snippet.slug}))
+        self.assertEqual(record['view'], 'snippet_detail_page')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertLessEqual(len(record['slowest']), 3)
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertIn(f'desc="{record["queries"]} queries"', response['Server-Timing'])
+
+    @override_settings(ROOT_URLCONF='pet_Snippets.tests.test_instrumentation')
+    def test_repeated_queries_are_reported(self):
+        for num in range(3):
+            Comment.objects.create(snippet=self.snippet, author=self.user, text=f'Comment {num}')
+        _, record = self.get_record('/n-plus-one')
+        self.assertIn(3, [duplicate['count'] for duplicate in record['duplicates']])
+
+    async def test_async_request_is_recorded(self):
+        with self.assertLogs('pet_Snippets.instrumentation', 'INFO') as logs:
+            response = await self.async_client.get(reverse('snippet_non_private_json'))
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['view'], 'snippet_non_private_json')
+        self.assertGreater(record['queries'], 0)
+        self.assertIn(f'desc="{record["queries"]} queries"', response['Server-Timing'])
+
+    def test_asgi_middleware_chain_stays_async(self):
+        # A sync-only middleware would run every ASGI request in a thread
+        self.assertNotIsInstance(ASGIHandler()._middleware_chain, SyncToAsync)
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_nothing_is_recorded_without_sampling(self):
+        with self.assertNoLogs('pet_Snippets.instrumentation', 'INFO'):
+            response = self.client.get(reverse('home'))
+        self.assertFalse(response.has_header('Server-Timing'))
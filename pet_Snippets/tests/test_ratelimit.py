@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from MainApp.models import Snippet, SupportedLang
+from pet_Snippets import ratelimit
+from pet_Snippets.ratelimit import MemoryBackend, parse_rate, take_token
+
+
+class TokenBucketTest(SimpleTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('30/m'), (30, 0.5))
+        self.assertEqual(parse_rate('5/10s'), (5, 0.5))
+        self.assertEqual(parse_rate('24/d'), (24, 1 / 3600))
+        with self.assertRaises(ValueError):
+            parse_rate('30 per minute')
+
+    def test_burst_then_refill(self):
+        state, results = None, []
+        for _ in range(4):
+            state, allowed, retry_after = take_token(state, 3, 0.5, 100.0)
+            results.append(allowed)
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(retry_after, 2)
+        state, allowed, _ = take_token(state, 3, 0.5, 101.0)
+        self.assertFalse(allowed)
+        state, allowed, _ = take_token(state, 3, 0.5, 102.0)
+        self.assertTrue(allowed)
+
+    def test_memory_backend_forgets_oldest_clients(self):
+        backend = MemoryBackend(max_keys=2)
+        for key in ('first', 'second', 'third'):
+            backend.consume(key, 1, 1)
+        self.assertEqual(list(backend.buckets), ['second', 'third'])
+        self.assertEqual(backend.consume('second', 1, 0.001)[0], False)
+
+
+@override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMITS={'like': '2/m', 'comment': '1/m'})
+class RateLimitViewTest(TestCase):
+    def setUp(self) -> None:
+        ratelimit.reset()
+        cache.clear()
+        self.user = User.objects.create_user(username='TestUser', password='Pa55w.rd')
+        self.other_user = User.objects.create_user(username='OtherUser', password='Pa55w.rd')
+        self.lang = SupportedLang.objects.create(lang='TestLang')
+        self.snippet = Snippet.objects.create(
+            name='TestName',
+            lang=self.lang,
+            code='TestCode',
+            is_private=False,
+            author=self.user
+        )
+        self.client.login(username='TestUser', password='Pa55w.rd')
+
+    def switch_like(self):
+        return self.client.get(reverse('switch_snippetlike', kwargs={'snippet_id': self.snippet.id}))
+
+    def test_over_rate_is_429(self):
+        self.assertEqual(self.switch_like().status_code, 200)
+        self.assertEqual(self.switch_like().status_code, 200)
+        response = self.switch_like()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(ratelimit.metrics(), {'like': {'allowed': 2, 'limited': 1}})
+
+    def test_likes_share_scope(self):
+        self.switch_like()
+        self.client.post(reverse('snippet_like', kwargs={'snippet_id': self.snippet.id}), {'liked': 'true'})
+        response = self.client.post(reverse('snippet_like', kwargs={'snippet_id': self.snippet.id}), {'liked': 'true'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_clients_have_own_buckets(self):
+        self.switch_like()
+        self.switch_like()
+        self.client.login(username='OtherUser', password='Pa55w.rd')
+        self.assertEqual(self.switch_like().status_code, 200)
+
+    def test_comments(self):
+        data = {'snippet': self.snippet.id, 'text': 'Test text'}
+        self.assertEqual(self.client.post(reverse('create_comment'), data).status_code, 302)
+        self.assertEqual(self.client.post(reverse('create_comment'), data).status_code, 429)
+        self.assertEqual(self.snippet.comment_set.count(), 1)
+
+    @override_settings(RATE_LIMIT_BACKEND='cache')
+    def test_cache_backend(self):
+        self.switch_like()
+        self.switch_like()
+        ratelimit.BACKENDS['memory'].reset()
+        self.assertEqual(self.switch_like().status_code, 429)
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(3):
+            self.assertEqual(self.switch_like().status_code, 200)
+        self.assertEqual(ratelimit.metrics(), {})
+
+    def test_metrics_view_is_for_staff(self):
+        self.switch_like()
+        response = self.client.get(reverse('ratelimit_metrics'))
+        self.assertEqual(response.status_code, 302)
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        response = self.client.get(reverse('ratelimit_metrics'))
+        self.assertEqual(response.json()['scopes'], {'like': {'allowed': 1, 'limited': 0}})
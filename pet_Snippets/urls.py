@@ -18,6 +18,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from MainApp import views as main_views
+from pet_Snippets import ratelimit
 
 
 urlpatterns = [
@@ -26,6 +27,7 @@ urlpatterns = [
     path('accounts/', include('Accounts.urls')),
     path('snippets/', include('MainApp.urls')),
     path('comment/', include('Comments.urls')),
-    path('ajax/', include('AJAX.urls'))
+    path('ajax/', include('AJAX.urls')),
+    path('ratelimit/metrics', ratelimit.metrics_view, name='ratelimit_metrics'),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pet_Snippets.settings')
 
 application = get_wsgi_application()
+
+from MainApp.leaderboards import start_scheduler  # noqa: E402 (needs the apps loaded)
+
+start_scheduler()